@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from api.core.config import settings
+from api.services.crawl_service import crawler_service
+from api.services.http_client import CrawlerSession
+from api.services.sources import save_papers
+
+async def backfill(days: int, categories, max_pages: int):
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    print(f"Backfilling ArXiv {', '.join(categories)} since {since.isoformat()}")
+
+    async with CrawlerSession() as session:
+        crawler_service.arxiv.session = session
+        try:
+            total = await crawler_service.arxiv.ingest(
+                sink=save_papers,
+                categories=categories,
+                since=since,
+                max_pages=max_pages,
+            )
+        finally:
+            crawler_service.arxiv.session = None
+
+    print(f"Backfilled {total} papers.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill arXiv papers. Safe to re-run: it resumes from the stored checkpoint.")
+    parser.add_argument("--days", type=int, default=7, help="how many days back to ingest")
+    parser.add_argument("--categories", nargs="+", default=settings.ARXIV_CATEGORIES, help="arXiv categories, e.g. cs.CV cs.LG cs.CL")
+    parser.add_argument("--max-pages", type=int, default=1000, help="page limit per category")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.days, args.categories, args.max_pages))
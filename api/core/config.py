@@ -1,9 +1,147 @@
+import os
+import tempfile
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
-    
+
+    # Database access from async code: blocking Supabase calls run on a bounded thread pool
+    # sharing one pooled HTTP client, so a worker serves up to this many queries at once
+    DB_POOL_SIZE: int = 20
+    DB_TIMEOUT: float = 30.0
+
+    # Crawler HTTP client
+    # Falls back to the HTTP_PROXY env var (see api/core/database.py) when unset
+    CRAWLER_PROXY: Optional[str] = None
+    CRAWLER_VERIFY_SSL: bool = False
+    CRAWLER_HTTP2: bool = True
+    CRAWLER_TIMEOUT: float = 30.0
+    CRAWLER_CONNECT_TIMEOUT: float = 10.0
+    CRAWLER_MAX_CONNECTIONS: int = 100
+    CRAWLER_MAX_KEEPALIVE: int = 20
+    CRAWLER_KEEPALIVE_EXPIRY: float = 30.0
+    CRAWLER_MAX_CONNECTIONS_PER_HOST: int = 10
+    CRAWLER_DNS_CACHE_TTL: float = 300.0
+
+    # Conditional-GET validator cache (ETag / Last-Modified), persisted on local disk
+    CRAWLER_HTTP_CACHE: bool = True
+    CRAWLER_CACHE_DIR: Optional[str] = None
+    CRAWLER_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+
+    # Raw response archive (zstd, content-addressed) for offline re-parsing; see api/reparse_archive.py
+    CRAWLER_ARCHIVE: bool = True
+    CRAWLER_ARCHIVE_DIR: Optional[str] = None  # defaults next to the HTTP cache
+    CRAWLER_ARCHIVE_LEVEL: int = 3  # zstd compression level
+    # Retention, by whole days of fetches; 0 disables either limit
+    CRAWLER_ARCHIVE_MAX_BYTES: int = 1024 * 1024 * 1024
+    CRAWLER_ARCHIVE_MAX_AGE_DAYS: int = 90
+
+    # Fan-out, per-host rate limiting and retries
+    CRAWLER_FANOUT_CONCURRENCY: int = 20
+    CRAWLER_HOST_RATE: float = 50.0  # requests/second per host
+    CRAWLER_HOST_BURST: float = 50.0
+    # Per-host overrides; arXiv asks for no more than one request every 3 seconds
+    CRAWLER_HOST_RATES: Dict[str, float] = {"export.arxiv.org": 1 / 3}
+    CRAWLER_MAX_RETRIES: int = 4
+    CRAWLER_BACKOFF_BASE: float = 0.5
+    CRAWLER_BACKOFF_MAX: float = 10.0
+
+    # GitHub trending matrix: "" is the all-languages page
+    GITHUB_TRENDING_LANGUAGES: List[str] = ["", "python", "javascript", "typescript", "go", "rust"]
+    GITHUB_TRENDING_WINDOWS: List[str] = ["daily", "weekly", "monthly"]
+    GITHUB_CRAWL_MAX_REQUESTS: int = 30
+    GITHUB_CRAWL_CONCURRENCY: int = 4
+    GITHUB_CRAWL_TIME_LIMIT: float = 45.0
+    GITHUB_HTML_PARSER: str = "auto"  # auto, selectolax, lxml, html.parser
+
+    # Incremental arXiv ingestion
+    ARXIV_CATEGORIES: List[str] = ["cs.CV"]
+    ARXIV_CATEGORY_SLUGS: Dict[str, str] = {"cs.CV": "object-detection"}  # others default to arxiv-<cat>
+    ARXIV_PAGE_SIZE: int = 100
+    ARXIV_MAX_PAGES: int = 10  # per category per run; the rest resumes next run
+    ARXIV_INITIAL_LOOKBACK_DAYS: int = 2  # how far back a category with no checkpoint starts
+    ARXIV_STREAMING: bool = True  # parse result pages incrementally while they download
+    ARXIV_WRITE_BATCH: int = 50  # papers per sink call while a page is still streaming
+
+    # In-memory categories table cache shared by crawlers and routers
+    CATEGORY_CACHE_TTL: float = 600.0
+
+    # In-memory cache for /api/github/trending and /api/papers/latest; emptied when a crawl finishes
+    RESPONSE_CACHE_TTL: float = 300.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # approximate, by JSON size
+    RESPONSE_CACHE_GENERATION_POLL: float = 15.0  # how often to look for crawls finished by other processes
+    # Optional shared tier in Redis (unset: off), so serverless instances share one warm cache
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    RESPONSE_CACHE_REDIS_TTL: float = 3600.0  # crawls invalidate entries; this only bounds memory
+    RESPONSE_CACHE_REDIS_TIMEOUT: float = 0.25  # seconds; a slow Redis must not be slower than the DB
+    RESPONSE_CACHE_REDIS_RETRY: float = 30.0  # after an error, skip Redis for this long
+
+    # Batched DB writes from the crawler
+    DB_WRITE_BATCH_SIZE: int = 500
+    DB_WRITE_PARALLELISM: int = 4
+
+    # Hacker News incremental refresh
+    HN_TOP_LIMIT: int = 20
+    HN_ITEM_CACHE_TTL: float = 3600.0  # unchanged items are refetched at least this often
+    HN_REFRESH_MAX_AGE_HOURS: int = 48  # keep score/comment counts live for stories this young
+
+    # Parse executor: CPU-bound parsing runs in a process pool so the API loop stays responsive
+    CRAWLER_PARSE_WORKERS: int = 2  # 0 parses in a worker thread instead
+    CRAWLER_PARSE_INLINE_BYTES: int = 16 * 1024  # smaller payloads are parsed inline
+
+    # Crawl executor: budget shared by every registered source in one run
+    CRAWL_MAX_IN_FLIGHT: int = 32  # upstream requests in flight across all sources
+    CRAWL_TIME_LIMIT: float = 55.0  # whole run; sources still going are cancelled
+    # Per-source overrides, e.g. {"hackernews": {"concurrency": 10, "timeout": 20}}
+    # Keys: concurrency (fetch stage), parse_concurrency, write_concurrency, write_batch, timeout
+    CRAWL_SOURCE_LIMITS: Dict[str, Dict[str, float]] = {}
+
+    # Streaming crawl pipeline: fetch -> parse -> normalize -> batched write, linked by bounded queues
+    PIPELINE_QUEUE_SIZE: int = 100  # items buffered between two stages
+    PIPELINE_PARSE_CONCURRENCY: int = 2  # matches CRAWLER_PARSE_WORKERS
+    PIPELINE_WRITE_CONCURRENCY: int = 2
+    PIPELINE_WRITE_BATCH: int = 100  # rows per write
+    PIPELINE_WRITE_LINGER: float = 0.25  # seconds to wait for a fuller batch
+
+    # Adaptive scheduling: each source's interval moves between its bounds (seconds)
+    # as its observed change rate rises and falls
+    CRAWL_INTERVAL_BOUNDS: Dict[str, Dict[str, float]] = {
+        "github": {"min": 3600, "max": 6 * 3600},
+        "arxiv": {"min": 3 * 3600, "max": 24 * 3600},  # new listings land once a day
+        "hackernews": {"min": 300, "max": 3600},
+    }
+    CRAWL_INTERVAL_MIN: float = 3600  # bounds for sources not listed above
+    CRAWL_INTERVAL_MAX: float = 24 * 3600
+    CRAWL_SCHEDULE_JITTER: float = 0.1  # +/- fraction of the interval
+    CRAWL_CHANGE_RATE_ALPHA: float = 0.3  # weight of the latest run in the change rate
+
+    # Crawl job queue (Celery). memory:// + cache+memory:// run without Redis, e.g. in tests
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CELERY_BROKER_URL: Optional[str] = None  # defaults to REDIS_URL
+    CELERY_RESULT_BACKEND: Optional[str] = None  # defaults to REDIS_URL
+    CELERY_TASK_ALWAYS_EAGER: bool = False  # run jobs in the API process (no worker), e.g. on Vercel
+    CRAWL_JOB_RESULT_TTL: int = 24 * 3600
+
+    # Single-flight crawl lease; the holder heartbeats every third of the TTL
+    CRAWL_LEASE_TTL: int = 90
+    # How long a queued crawl job blocks queueing another; one not started by then is presumed lost
+    CRAWL_QUEUE_TTL: int = 3600
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
+
+
+def local_data_dir(configured: Optional[str], name: str) -> str:
+    """
+    Directory for crawler data kept on local disk: `configured` if set, else .cache/<name>.
+    """
+    if configured:
+        return configured
+    # Serverless filesystems are read-only except for /tmp
+    if os.environ.get("VERCEL") == "1":
+        return os.path.join(tempfile.gettempdir(), "techvision", name)
+    return os.path.join(".cache", name)
@@ -1,7 +1,16 @@
-from supabase import create_client, Client
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+import httpx
+from supabase import create_client, Client, ClientOptions
 from .config import settings
 import os
 
+T = TypeVar("T")
+
 # Fix for SSL/Connection errors in some network environments (e.g. China)
 # Try to detect and use common local proxy ports if no proxy is set
 # ONLY apply this fix in local development environment, NOT in production (Vercel/Render)
@@ -13,4 +22,38 @@ if os.environ.get("VERCEL") != "1" and os.environ.get("RENDER") != "true" and no
     os.environ["HTTP_PROXY"] = proxy_url
     os.environ["HTTPS_PROXY"] = proxy_url
 
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# One keep-alive connection per DB thread, so concurrent queries don't queue on the pool or reconnect
+_http = httpx.Client(
+    limits=httpx.Limits(max_connections=settings.DB_POOL_SIZE, max_keepalive_connections=settings.DB_POOL_SIZE),
+    timeout=settings.DB_TIMEOUT,
+    follow_redirects=True,
+)
+
+supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY, ClientOptions(httpx_client=_http))
+
+# Password sign-ins go through their own client: signing in switches a client's
+# Authorization header to the user's token, which must never leak into the
+# service client's queries running concurrently on other threads
+auth_client: Client = create_client(
+    settings.SUPABASE_URL, settings.SUPABASE_KEY,
+    ClientOptions(auto_refresh_token=False, persist_session=False),
+)
+
+_db_pool = ThreadPoolExecutor(max_workers=settings.DB_POOL_SIZE, thread_name_prefix="db")
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Supabase call on the DB thread pool without blocking the event loop.
+    Like asyncio.to_thread, context variables (crawl metrics) carry over.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_db_pool, partial(context.run, func, *args, **kwargs))
+
+
+async def execute(query) -> Any:
+    """
+    Await a built query: `res = await execute(supabase.table("papers").select("*"))`.
+    """
+    return await run_db(query.execute)
@@ -14,6 +14,7 @@ class GithubProjectBase(BaseModel):
     forks: int
     url: str
     trending_date: date
+    since: str = "daily"  # trending window: daily, weekly, monthly
 
 class GithubProject(GithubProjectBase):
     id: int
@@ -31,6 +32,9 @@ class PaperBase(BaseModel):
     code_url: Optional[str] = None
     published_date: date
     source: str
+    external_id: Optional[str] = None  # arXiv id / HN item id
+    score: Optional[int] = None  # HN points
+    comments: Optional[int] = None  # HN comment count
     category_id: Optional[UUID] = None
 
 class Paper(PaperBase):
@@ -106,6 +110,7 @@ class Subscription(SubscriptionBase):
 # Response Models
 class PaginatedResponse(BaseModel):
     data: List[dict]
-    total: int
-    page: int
+    total: Optional[int] = None  # None with count=none
+    page: Optional[int] = None  # None in cursor mode
     limit: int
+    next_cursor: Optional[str] = None  # pass as `cursor` for the next page; None on the last one
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from api.services.archive import response_archive
+from api.services.change_detection import new_stats
+from api.services.crawlers import ArxivCrawler, HackerNewsCrawler
+from api.services.reparse import parse_archived
+from api.services.sources import save_projects, save_papers
+
+# Re-parse archived raw responses with the current parsers and write the results,
+# e.g. after fixing a parser that silently returned nothing. No upstream requests are made.
+
+
+def parse_all(entries: List[Dict[str, Any]], workers: int):
+    """
+    Parse archived responses across `workers` processes, yielding results in fetch order.
+    """
+    parse = partial(parse_archived, response_archive.root)
+    if workers <= 1:
+        yield from map(parse, entries)
+        return
+    # spawn, like the crawler's parse pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield from pool.map(parse, entries, chunksize=8)
+
+
+def collect(results) -> Dict[str, Dict[tuple, Dict[str, Any]]]:
+    """
+    Turn parse results into rows keyed on their natural key. Results arrive oldest
+    first, so where a row was archived several times the newest copy wins.
+    """
+    projects, papers = {}, {}
+    category_ids = {}
+    empty = 0
+    hn_category = None
+
+    for result in results:
+        kind, rows = result["kind"], result["rows"]
+        if kind is None:
+            continue
+        if not rows:
+            empty += 1
+            print(f"No rows parsed from {result['entry']['url']} ({result['entry']['fetched_at']})")
+            continue
+
+        if kind == "projects":
+            for row in rows:
+                projects[(row["repo_id"], row["since"])] = row
+        elif kind == "arxiv":
+            category = result["category"]
+            if category not in category_ids:
+                category_ids[category] = ArxivCrawler()._category_id(category)
+            for row in rows:
+                row["category_id"] = category_ids[category]
+                papers[(row["source"], row["external_id"])] = row
+        elif kind == "hn_item":
+            if hn_category is None:
+                hn_category = HackerNewsCrawler()._category_id()
+            paper = HackerNewsCrawler._to_paper(rows[0], hn_category)
+            if paper:
+                papers[(paper["source"], paper["external_id"])] = paper
+
+    if empty:
+        print(f"{empty} archived responses parsed to nothing")
+    return {"projects": projects, "papers": papers}
+
+
+async def write(rows: Dict[str, Dict[tuple, Dict[str, Any]]]):
+    stats = {"projects": new_stats(), "papers": new_stats()}
+    if rows["projects"]:
+        await save_projects(list(rows["projects"].values()), stats["projects"])
+    if rows["papers"]:
+        await save_papers(list(rows["papers"].values()), stats["papers"])
+    for kind, counts in stats.items():
+        print(f"{kind}: {counts['new']} new, {counts['changed']} changed, {counts['skipped']} unchanged (skipped)")
+
+
+def reparse(sources: Optional[List[str]], since: Optional[datetime], until: Optional[datetime], workers: int, dry_run: bool):
+    entries = list(response_archive.entries(sources, since, until))
+    print(f"Re-parsing {len(entries)} archived responses from {response_archive.root} with {workers} workers")
+
+    rows = collect(parse_all(entries, workers))
+    print(f"Parsed {len(rows['projects'])} projects and {len(rows['papers'])} papers")
+    if dry_run:
+        return
+    asyncio.run(write(rows))
+
+
+def parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse archived crawl responses and backfill the database, offline.")
+    parser.add_argument("--sources", nargs="+", help="archive sources, e.g. github arxiv hackernews (default: all)")
+    parser.add_argument("--since", type=parse_date, help="only responses fetched at or after this time (ISO date/datetime, UTC)")
+    parser.add_argument("--until", type=parse_date, help="only responses fetched before this time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes")
+    parser.add_argument("--dry-run", action="store_true", help="parse and report, but don't write")
+    args = parser.parse_args()
+
+    reparse(args.sources, args.since, args.until, args.workers, args.dry_run)
@@ -1,23 +1,107 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from api.services.crawlers import crawler_service
+import asyncio
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from api.core.database import run_db
+from api.services.jobs import enqueue_crawl, job_status, queue_owner
+from api.services.lease import crawl_lease, crawl_queue
+from api.services.crawl_runs import list_runs, get_run
+from api.services.categories import category_registry
+from api.services.response_cache import response_cache
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
+async def _queue_crawl(sources: Optional[List[str]], due_only: bool):
+    # A crawl already in flight is joined, not duplicated
+    try:
+        lease = await run_db(crawl_lease.current)
+    except Exception as e:
+        print(f"Could not read crawl lease: {e}")
+        lease = None
+    if lease:
+        return {"message": "Crawl already in progress", "run_id": lease["run_id"], "job_id": lease.get("job_id"), "attached": True}
+
+    # So is a job still waiting for a worker: claim the queue slot before enqueueing
+    job_id = str(uuid.uuid4())
+    try:
+        claimed = await run_db(crawl_queue.acquire, queue_owner(job_id), None, job_id)
+    except Exception as e:
+        print(f"Could not record queued crawl job, queueing anyway: {e}")
+        claimed = {}
+    if claimed is None:
+        queued = await run_db(crawl_queue.current)
+        # Nothing left if it was picked up in between; the run lease then covers it
+        return {"message": "Crawl job already queued", "job_id": (queued or {}).get("job_id"), "attached": True}
+
+    try:
+        await asyncio.to_thread(enqueue_crawl, sources, due_only, job_id)
+    except Exception as e:
+        try:
+            await run_db(crawl_queue.release, queue_owner(job_id))
+        except Exception as release_error:
+            print(f"Failed to clear queued crawl job (it will expire on its own): {release_error}")
+        raise HTTPException(status_code=503, detail=f"Could not queue crawl job: {e}")
+    return {"message": "Crawl job queued", "job_id": job_id}
+
 @router.post("/crawl")
-async def trigger_crawl(background_tasks: BackgroundTasks):
+async def trigger_crawl(force: bool = True, sources: Optional[List[str]] = Query(None)):
     """
-    Trigger a background crawl task for all sources.
+    Queue a crawl job for all sources (or just `sources`; only the due ones with force=false).
+    Poll GET /api/admin/jobs/{job_id} for its progress.
     """
-    background_tasks.add_task(crawler_service.crawl_all)
-    return {"message": "Crawl task started in background"}
+    return await _queue_crawl(sources, not force)
 
 @router.get("/crawl")
-async def trigger_crawl_cron():
+async def trigger_crawl_cron(force: bool = False):
     """
-    Trigger a synchronous crawl task (for Vercel Cron).
+    Queue a crawl job (for Vercel Cron).
+    Each tick crawls only the sources that are due; force=true crawls all of them.
     """
-    try:
-        result = await crawler_service.crawl_all()
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _queue_crawl(None, not force)
+
+@router.get("/crawl/runs")
+async def get_crawl_runs(limit: int = Query(20, ge=1, le=200), status: Optional[str] = None):
+    """
+    Recent crawl runs, newest first, with per-source telemetry in `summary.sources`:
+    request count, bytes, retries, fetch latency percentiles, parse/write time and rows/sec.
+    """
+    return await run_db(list_runs, limit, status)
+
+@router.get("/crawl/runs/{run_id}")
+async def get_crawl_run(run_id: uuid.UUID):
+    run = await run_db(get_run, str(run_id))
+    if run is None:
+        raise HTTPException(status_code=404, detail="Crawl run not found")
+    return run
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a queued crawl job, with the crawl summary once it has finished.
+    """
+    return await asyncio.to_thread(job_status, job_id)
+
+@router.post("/categories/refresh")
+async def refresh_categories():
+    """
+    Drop the cached categories so the next lookup reloads them (call after editing categories).
+    """
+    category_registry.invalidate()
+    return {"message": "Category cache invalidated"}
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Response cache counters for this API process: hits, misses, evictions and the data generation,
+    plus the shared Redis tier's when it is on.
+    """
+    return response_cache.stats()
+
+@router.post("/cache/clear")
+async def clear_cache():
+    """
+    Drop cached responses, in Redis too when the shared tier is on (e.g. after editing rows by hand).
+    """
+    await response_cache.invalidate()
+    return {"message": "Response cache cleared", "generation": response_cache.generation}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from api.core.database import supabase
+from api.core.database import supabase, auth_client, execute, run_db
 from api.models.auth import UserSignup, UserLogin, Token
 from api.models.schemas import User
 
@@ -19,7 +19,7 @@ async def signup(user: UserSignup):
         # Sign up with Supabase Auth using Admin API (bypasses "Signups disabled" and "Confirm email")
         try:
             # Note: supabase-py client initialized with service_role key has admin privileges
-            auth_response = supabase.auth.admin.create_user({
+            auth_response = await run_db(supabase.auth.admin.create_user, {
                 "email": fake_email,
                 "password": user.password,
                 "email_confirm": True, # Auto confirm email
@@ -52,7 +52,8 @@ async def signup(user: UserSignup):
         
         # Since admin.create_user doesn't return a session, we need to sign in to get one
         try:
-            login_response = supabase.auth.sign_in_with_password({
+            # auth_client, not supabase: a sign-in swaps the client's token for the user's
+            login_response = await run_db(auth_client.auth.sign_in_with_password, {
                 "email": fake_email,
                 "password": user.password
             })
@@ -86,7 +87,7 @@ async def login(user: UserLogin):
         # Construct the fake email from username
         fake_email = f"{user.username}@hots.local"
         
-        auth_response = supabase.auth.sign_in_with_password({
+        auth_response = await run_db(auth_client.auth.sign_in_with_password, {
             "email": fake_email,
             "password": user.password
         })
@@ -99,7 +100,7 @@ async def login(user: UserLogin):
             raise HTTPException(status_code=401, detail="Invalid credentials")
             
         # Fetch username from our users table
-        db_user = supabase.table("users").select("username").eq("id", auth_response.user.id).single().execute()
+        db_user = await execute(supabase.table("users").select("username").eq("id", auth_response.user.id).single())
         username = db_user.data.get("username") if db_user.data else user.username
 
         return {
@@ -119,7 +120,7 @@ async def login(user: UserLogin):
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
-        user = supabase.auth.get_user(token)
+        user = await run_db(supabase.auth.get_user, token)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
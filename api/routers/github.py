@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Query, HTTPException
 from typing import List, Optional
-from api.core.database import supabase
+from api.core.database import supabase, execute
 from api.models.schemas import GithubProject, PaginatedResponse
+from api.services.pagination import CountMode, decode_cursor, paginate
+from api.services.response_cache import response_cache
 
 router = APIRouter(prefix="/api/github", tags=["github"])
 
@@ -10,34 +12,39 @@ async def get_trending_projects(
     language: Optional[str] = None,
     since: Optional[str] = None, # daily, weekly, monthly
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,  # next_cursor of the previous page; replaces `page`
+    count: Optional[CountMode] = None,  # default: exact for page, none for cursor
 ):
+    # Each repo is stored once per trending window
+    since = since or "daily"
     try:
-        query = supabase.table("github_projects").select("*", count="exact")
-        
+        after = decode_cursor(cursor, "github_projects", "stars") if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    count = count or ("none" if cursor else "exact")
+    return await response_cache.get_or_load(
+        "github_trending",
+        {"language": language, "since": since, "page": None if cursor else page, "limit": limit, "cursor": cursor, "count": count},
+        lambda: _load_trending(language, since, page, limit, after, count),
+    )
+
+async def _load_trending(language: Optional[str], since: str, page: int, limit: int, after, count: CountMode):
+    try:
+        filters = {"since": since}
         if language:
-            query = query.eq("language", language)
-            
-        # Pagination
-        start = (page - 1) * limit
-        end = start + limit - 1
-        query = query.range(start, end).order("stars", desc=True)
-        
-        response = query.execute()
-        
-        return {
-            "data": response.data,
-            "total": response.count,
-            "page": page,
-            "limit": limit
-        }
+            filters["language"] = language
+        return await paginate("github_projects", "stars", filters, limit, page=page, after=after, count=count)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{project_id}", response_model=GithubProject)
 async def get_project_details(project_id: int):
+    return await response_cache.get_or_load("github_project", {"id": project_id}, lambda: _load_project(project_id))
+
+async def _load_project(project_id: int):
     try:
-        response = supabase.table("github_projects").select("*").eq("id", project_id).single().execute()
+        response = await execute(supabase.table("github_projects").select("*").eq("id", project_id).single())
         return response.data
     except Exception as e:
         raise HTTPException(status_code=404, detail="Project not found")
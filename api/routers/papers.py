@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Query, HTTPException
 from typing import List, Optional
 from uuid import UUID
-from api.core.database import supabase
+from api.core.database import supabase, execute, run_db
 from api.models.schemas import Paper, PaginatedResponse
+from api.services.pagination import CountMode, decode_cursor, paginate
+from api.services.categories import category_registry
+from api.services.response_cache import response_cache
 
 router = APIRouter(prefix="/api/papers", tags=["papers"])
 
@@ -11,52 +14,55 @@ async def get_latest_papers(
     category: Optional[str] = None,
     source: Optional[str] = None,
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,  # next_cursor of the previous page; replaces `page`
+    count: Optional[CountMode] = None,  # default: exact for page, none for cursor
 ):
     try:
-        query = supabase.table("papers").select("*", count="exact")
-        
+        after = decode_cursor(cursor, "papers", "published_date") if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    count = count or ("none" if cursor else "exact")
+    return await response_cache.get_or_load(
+        "papers_latest",
+        {"category": category, "source": source, "page": None if cursor else page, "limit": limit, "cursor": cursor, "count": count},
+        lambda: _load_latest(category, source, page, limit, after, count),
+    )
+
+async def _load_latest(category: Optional[str], source: Optional[str], page: int, limit: int, after, count: CountMode):
+    try:
+        filters = {}
         if category:
-            # First get category id from slug or name if possible, 
-            # assuming category param is the category slug or ID. 
-            # For simplicity, let's assume it might be ID or we filter by category_id if UUID
-            pass
-            # For now, let's just filter if it's a UUID, otherwise maybe join?
-            # Supabase-py doesn't support complex joins easily in one go without raw sql or specific syntax
-            # Let's assume frontend sends category_id for now or we filter by joining.
-            # A simpler way is to filter by category_id if provided.
+            # Accept either a category id or a slug; slugs resolve from the in-memory registry
+            try:
+                category_id = str(UUID(category))
+            except ValueError:
+                category_id = await run_db(category_registry.id_for, category)
+            if not category_id:
+                return {"data": [], "total": 0, "page": page, "limit": limit, "next_cursor": None}
+            filters["category_id"] = category_id
         
         if source:
-            query = query.eq("source", source)
-            
-        # Pagination
-        start = (page - 1) * limit
-        end = start + limit - 1
-        query = query.range(start, end).order("published_date", desc=True)
-        
-        response = query.execute()
-        
-        return {
-            "data": response.data,
-            "total": response.count,
-            "page": page,
-            "limit": limit
-        }
+            filters["source"] = source
+
+        return await paginate("papers", "published_date", filters, limit, page=page, after=after, count=count)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/categories")
 async def get_categories():
     try:
-        response = supabase.table("categories").select("*").execute()
-        return response.data
+        return await run_db(category_registry.all)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{paper_id}", response_model=Paper)
 async def get_paper_details(paper_id: UUID):
+    return await response_cache.get_or_load("paper", {"id": str(paper_id)}, lambda: _load_paper(paper_id))
+
+async def _load_paper(paper_id: UUID):
     try:
-        response = supabase.table("papers").select("*").eq("id", str(paper_id)).single().execute()
+        response = await execute(supabase.table("papers").select("*").eq("id", str(paper_id)).single())
         return response.data
     except Exception as e:
         raise HTTPException(status_code=404, detail="Paper not found")
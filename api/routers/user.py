@@ -1,6 +1,7 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-from api.core.database import supabase
+from api.core.database import supabase, execute
 from api.models.schemas import Favorite, FavoriteCreate
 from api.routers.auth import get_current_user
 
@@ -10,7 +11,7 @@ router = APIRouter(prefix="/api/user", tags=["user"])
 async def get_favorites(current_user: dict = Depends(get_current_user)):
     try:
         user_id = current_user.id
-        response = supabase.table("favorites").select("*").eq("user_id", user_id).execute()
+        response = await execute(supabase.table("favorites").select("*").eq("user_id", user_id))
         return response.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -20,25 +21,23 @@ async def get_enriched_favorites(current_user: dict = Depends(get_current_user))
     try:
         user_id = current_user.id
         # Get all favorites
-        favs = supabase.table("favorites").select("*").eq("user_id", user_id).execute().data
+        favs = (await execute(supabase.table("favorites").select("*").eq("user_id", user_id))).data
         
         project_ids = [int(f['item_id']) for f in favs if f['item_type'] == 'project' and f['item_id'].isdigit()]
         paper_ids = [f['item_id'] for f in favs if f['item_type'] == 'paper']
         
-        projects = []
-        if project_ids:
-            # Fetch projects
+        async def fetch_items(table, ids):
+            if not ids:
+                return []
             # Note: Supabase-py doesn't support 'in_' very well in some versions, but 'in' operator is standard.
-            # .in_("id", project_ids)
-            p_res = supabase.table("github_projects").select("*").in_("id", project_ids).execute()
-            projects = p_res.data
-            
-        papers = []
-        if paper_ids:
-            # Fetch papers
-            p_res = supabase.table("papers").select("*").in_("id", paper_ids).execute()
-            papers = p_res.data
-            
+            return (await execute(supabase.table(table).select("*").in_("id", ids))).data
+
+        # Projects and papers are independent lookups, so they run concurrently
+        projects, papers = await asyncio.gather(
+            fetch_items("github_projects", project_ids),
+            fetch_items("papers", paper_ids),
+        )
+
         return {
             "projects": projects,
             "papers": papers
@@ -54,7 +53,7 @@ async def add_favorite(favorite: FavoriteCreate, current_user: dict = Depends(ge
         data = favorite.dict()
         data["user_id"] = user_id
         
-        response = supabase.table("favorites").insert(data).execute()
+        response = await execute(supabase.table("favorites").insert(data))
         return response.data[0]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -63,7 +62,7 @@ async def add_favorite(favorite: FavoriteCreate, current_user: dict = Depends(ge
 async def remove_favorite(item_type: str, item_id: str, current_user: dict = Depends(get_current_user)):
     try:
         user_id = current_user.id
-        response = supabase.table("favorites").delete().eq("user_id", user_id).eq("item_type", item_type).eq("item_id", item_id).execute()
+        response = await execute(supabase.table("favorites").delete().eq("user_id", user_id).eq("item_type", item_type).eq("item_id", item_id))
         return {"message": "Favorite removed"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
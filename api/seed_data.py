@@ -16,7 +16,8 @@ async def seed_data():
             "stars": 65000,
             "forks": 5000,
             "url": "https://github.com/tiangolo/fastapi",
-            "trending_date": date.today().isoformat()
+            "trending_date": date.today().isoformat(),
+            "since": "daily"
         },
         {
             "repo_id": "2",
@@ -27,7 +28,8 @@ async def seed_data():
             "stars": 213000,
             "forks": 45000,
             "url": "https://github.com/facebook/react",
-            "trending_date": date.today().isoformat()
+            "trending_date": date.today().isoformat(),
+            "since": "daily"
         },
         {
             "repo_id": "3",
@@ -38,13 +40,14 @@ async def seed_data():
             "stars": 85000,
             "forks": 11000,
             "url": "https://github.com/rust-lang/rust",
-            "trending_date": date.today().isoformat()
+            "trending_date": date.today().isoformat(),
+            "since": "daily"
         }
     ]
 
     for p in projects:
         try:
-            supabase.table("github_projects").upsert(p, on_conflict="repo_id").execute()
+            supabase.table("github_projects").upsert(p, on_conflict="repo_id,since").execute()
             print(f"Upserted project: {p['name']}")
         except Exception as e:
             print(f"Error upserting project {p['name']}: {e}")
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from api.core.config import settings, local_data_dir
+
+try:
+    import zstandard
+except ImportError:  # archiving is skipped without it
+    zstandard = None
+
+
+def default_archive_dir() -> str:
+    return local_data_dir(settings.CRAWLER_ARCHIVE_DIR, "archive")
+
+
+class ArchiveWriter:
+    """
+    One response being archived while it downloads: each chunk is hashed and
+    compressed into a temp file as it arrives, so the body is never held whole.
+    close() files it under its hash and indexes it; abort() throws it away.
+    """
+    def __init__(self, archive: "ResponseArchive", source: str, url: str,
+                 content_type: Optional[str] = None, fetched_at: Optional[datetime] = None):
+        self.archive = archive
+        self.source = source
+        self.url = url
+        self.content_type = content_type
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
+        self.bytes = 0
+        self._hash = hashlib.sha256()
+        objects = os.path.join(archive.root, "objects")
+        os.makedirs(objects, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=objects, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self._compressor = zstandard.ZstdCompressor(level=archive.level).stream_writer(self._file)
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self.bytes += len(chunk)
+        self._compressor.write(chunk)
+
+    def close(self) -> Optional[str]:
+        """
+        Finish the object and index it. Returns the body's sha256, or None for an empty body.
+        """
+        if not self.bytes:
+            self.abort()
+            return None
+        self._compressor.flush(zstandard.FLUSH_FRAME)
+        self._file.close()
+        digest = self._hash.hexdigest()
+        self.archive._store(self._tmp, {
+            "fetched_at": self.fetched_at.isoformat(),
+            "source": self.source,
+            "url": self.url,
+            "sha256": digest,
+            "bytes": self.bytes,
+            "content_type": self.content_type,
+        })
+        return digest
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+class ResponseArchive:
+    """
+    Local archive of raw upstream responses, so pages can be re-parsed later.
+
+    Bodies are stored once per distinct content, zstd-compressed, under
+    objects/<sha256[:2]>/<sha256>.zst. Every fetch appends a line to
+    index/<source>/<YYYY-MM-DD>.jsonl with the URL, fetch time and body hash,
+    so a source's history can be replayed in order without touching the network.
+
+    Retention is by whole days: index days older than `max_age_days` are
+    dropped, then the oldest remaining days until the objects still referenced
+    fit in `max_bytes`. Objects no index line refers to are deleted. This runs
+    at most every PRUNE_INTERVAL seconds, on the next write.
+    """
+    PRUNE_INTERVAL = 3600
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        level: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age_days: Optional[int] = None,
+    ):
+        self.root = root or default_archive_dir()
+        self.level = settings.CRAWLER_ARCHIVE_LEVEL if level is None else level
+        self.max_bytes = settings.CRAWLER_ARCHIVE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age_days = settings.CRAWLER_ARCHIVE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._lock = threading.Lock()
+        self._pruned_at: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CRAWLER_ARCHIVE and zstandard is not None
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.zst")
+
+    def _index_path(self, source: str, day: str) -> str:
+        return os.path.join(self.root, "index", source, f"{day}.jsonl")
+
+    def writer(
+        self,
+        source: str,
+        url: str,
+        content_type: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ) -> ArchiveWriter:
+        """
+        Start archiving a response whose body arrives in chunks.
+        """
+        return ArchiveWriter(self, source, url, content_type, fetched_at)
+
+    def put(
+        self,
+        source: str,
+        url: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ) -> Optional[str]:
+        """
+        Archive one response body and index it. Returns the body's sha256.
+        """
+        writer = self.writer(source, url, content_type, fetched_at)
+        writer.write(body)
+        return writer.close()
+
+    def _store(self, tmp: str, entry: Dict[str, Any]):
+        path = self._object_path(entry["sha256"])
+        index = self._index_path(entry["source"], entry["fetched_at"][:10])
+        # Object and index line land together, so prune() never sees one without the other
+        with self._lock:
+            if os.path.exists(path):
+                # Same content archived before: keep the existing object
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+            os.makedirs(os.path.dirname(index), exist_ok=True)
+            with open(index, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        now = time.monotonic()
+        if self._pruned_at is None or now - self._pruned_at >= self.PRUNE_INTERVAL:
+            self._pruned_at = now
+            self.prune()
+
+    def read(self, digest: str) -> bytes:
+        # Streamed objects don't record their size up front, so decompress as a stream
+        with open(self._object_path(digest), "rb") as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Apply the retention limits now. Returns how many index days and objects were removed.
+        """
+        with self._lock:
+            return self._prune()
+
+    def _prune(self) -> Dict[str, int]:
+        # day -> index files of that day (one per source); digest -> last day it was fetched
+        days: Dict[str, List[str]] = {}
+        last_seen: Dict[str, str] = {}
+        index_root = os.path.join(self.root, "index")
+        for source in self.sources():
+            directory = os.path.join(index_root, source)
+            for name in os.listdir(directory):
+                if not name.endswith(".jsonl"):
+                    continue
+                day, path = name[:-len(".jsonl")], os.path.join(directory, name)
+                days.setdefault(day, []).append(path)
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        digest = json.loads(line)["sha256"]
+                        last_seen[digest] = max(day, last_seen.get(digest, day))
+
+        objects: Dict[str, int] = {}
+        objects_root = os.path.join(self.root, "objects")
+        for directory, _, names in os.walk(objects_root):
+            for name in names:
+                path = os.path.join(directory, name)
+                if name.endswith(".tmp"):
+                    # Left by a crawl that died mid-download
+                    try:
+                        if time.time() - os.path.getmtime(path) > self.PRUNE_INTERVAL:
+                            os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                if name.endswith(".zst"):
+                    objects[name[:-len(".zst")]] = os.path.getsize(path)
+
+        dropped = set()
+        if self.max_age_days:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=self.max_age_days)).date().isoformat()
+            dropped.update(day for day in days if day < cutoff)
+        if self.max_bytes:
+            # Bytes still referenced once every day up to and including `day` is gone
+            total = sum(size for digest, size in objects.items() if last_seen.get(digest, "") > max(dropped, default=""))
+            by_day: Dict[str, int] = {}
+            for digest, day in last_seen.items():
+                by_day[day] = by_day.get(day, 0) + objects.get(digest, 0)
+            for day in sorted(days):
+                if total <= self.max_bytes:
+                    break
+                if day not in dropped:
+                    dropped.add(day)
+                    total -= by_day.get(day, 0)
+
+        for day in dropped:
+            for path in days[day]:
+                os.remove(path)
+        keep = max(dropped, default="")
+        removed = 0
+        for digest in objects:
+            if last_seen.get(digest, "") <= keep:
+                os.remove(self._object_path(digest))
+                removed += 1
+        return {"days": len(dropped), "objects": removed}
+
+    def sources(self) -> List[str]:
+        try:
+            return sorted(os.listdir(os.path.join(self.root, "index")))
+        except FileNotFoundError:
+            return []
+
+    def entries(
+        self,
+        sources: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Index entries for `sources` (default: all) fetched in [since, until), oldest first.
+        """
+        entries = []
+        for source in sources or self.sources():
+            directory = os.path.join(self.root, "index", source)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                day = name[:-len(".jsonl")]
+                # Whole days outside the window are skipped without reading them
+                if since and day < since.date().isoformat():
+                    continue
+                if until and day > until.date().isoformat():
+                    continue
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        fetched_at = datetime.fromisoformat(entry["fetched_at"])
+                        if (since and fetched_at < since) or (until and fetched_at >= until):
+                            continue
+                        entries.append(entry)
+        entries.sort(key=lambda e: e["fetched_at"])
+        return iter(entries)
+
+
+response_archive = ResponseArchive()
@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from api.core.config import settings
+from api.core.database import supabase
+
+
+class CategoryRegistry:
+    """
+    Process-wide cache of the categories table.
+
+    All rows are loaded in one query and kept for CATEGORY_CACHE_TTL seconds;
+    slug lookups are then served from memory. Call invalidate() when categories
+    change outside this process.
+    """
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = settings.CATEGORY_CACHE_TTL if ttl is None else ttl
+        self._by_slug: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        res = supabase.table("categories").select("*").execute()
+        self._by_slug = {row["slug"]: row for row in res.data}
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._load()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def all(self) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        return list(self._by_slug.values())
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        return self._by_slug.get(slug)
+
+    def id_for(self, slug: str) -> Optional[str]:
+        category = self.get(slug)
+        return category["id"] if category else None
+
+    def ensure(self, slug: str, name: str, description: Optional[str] = None) -> str:
+        """
+        Return the id for `slug`, creating the category if it doesn't exist yet.
+        Creation is INSERT ... ON CONFLICT DO NOTHING, so concurrent crawlers can't duplicate it.
+        """
+        category_id = self.id_for(slug)
+        if category_id:
+            return category_id
+
+        with self._lock:
+            supabase.table("categories").upsert(
+                {"name": name, "slug": slug, "description": description},
+                on_conflict="slug",
+                ignore_duplicates=True,
+            ).execute()
+            # Re-read everything: picks up our row or the one another process won the race with
+            self._load()
+        return self._by_slug[slug]["id"]
+
+
+category_registry = CategoryRegistry()
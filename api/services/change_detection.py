@@ -0,0 +1,85 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.core.database import supabase, run_db
+
+# Columns that are bookkeeping, not content
+IGNORED_FIELDS = {"id", "created_at", "content_hash"}
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """
+    Stable SHA-256 of a normalized record: key order and bookkeeping columns don't matter.
+    """
+    payload = {k: v for k, v in row.items() if k not in IGNORED_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def new_stats() -> Dict[str, int]:
+    return {"new": 0, "changed": 0, "skipped": 0}
+
+
+class ChangeDetector:
+    """
+    Drops rows whose content hash matches what is already stored.
+
+    Existing hashes are read from the table's content_hash column, matched on the
+    table's natural key. The first key column is used for the IN (...) lookup and
+    the rest are compared in Python.
+    """
+    LOOKUP_CHUNK = 100  # keeps the IN (...) filter well under URL length limits
+
+    def __init__(self, table: str, key_columns: Tuple[str, ...]):
+        self.table = table
+        self.key_columns = key_columns
+
+    def _key(self, row: Dict[str, Any]) -> Tuple:
+        return tuple(str(row.get(k)) for k in self.key_columns)
+
+    def _existing_hashes(self, rows: List[Dict[str, Any]]) -> Dict[Tuple, Optional[str]]:
+        lookup = self.key_columns[0]
+        values = sorted({str(row[lookup]) for row in rows if row.get(lookup) is not None})
+        columns = ",".join(self.key_columns + ("content_hash",))
+
+        existing = {}
+        for i in range(0, len(values), self.LOOKUP_CHUNK):
+            res = supabase.table(self.table).select(columns).in_(lookup, values[i:i + self.LOOKUP_CHUNK]).execute()
+            for stored in res.data:
+                existing[self._key(stored)] = stored.get("content_hash")
+        return existing
+
+    async def filter(self, rows: List[Dict[str, Any]], stats: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Stamp each row with its content_hash and return only new or changed rows.
+        Counts go into `stats` (see new_stats).
+        """
+        stats = stats if stats is not None else new_stats()
+        if not rows:
+            return []
+
+        try:
+            existing = await run_db(self._existing_hashes, rows)
+        except Exception as e:
+            # Without the index we can't tell, so write everything
+            print(f"Hash lookup on {self.table} failed, writing all rows: {e}")
+            existing = {}
+
+        changed_rows = []
+        for row in rows:
+            row["content_hash"] = content_hash(row)
+            key = self._key(row)
+            if key not in existing:
+                stats["new"] += 1
+            elif existing[key] != row["content_hash"]:
+                stats["changed"] += 1
+            else:
+                stats["skipped"] += 1
+                continue
+            changed_rows.append(row)
+        return changed_rows
+
+
+project_changes = ChangeDetector("github_projects", ("repo_id", "since"))
+paper_changes = ChangeDetector("papers", ("external_id", "source"))
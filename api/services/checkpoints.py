@@ -0,0 +1,17 @@
+from typing import Any, Dict
+
+from api.core.database import supabase
+
+
+def load_checkpoint(source: str, key: str) -> Dict[str, Any]:
+    """
+    Return the stored checkpoint row for (source, key), or {} if there is none.
+    """
+    res = supabase.table("crawl_checkpoints").select("*").eq("source", source).eq("key", key).execute()
+    return res.data[0] if res.data else {}
+
+
+def save_checkpoint(source: str, key: str, **fields):
+    supabase.table("crawl_checkpoints").upsert(
+        {"source": source, "key": key, **fields}, on_conflict="source,key"
+    ).execute()
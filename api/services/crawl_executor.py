@@ -0,0 +1,101 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from api.core.config import settings
+from api.services.change_detection import new_stats
+from api.services.http_cache import NotModified
+from api.services.http_client import CrawlerSession
+from api.services.sources import CrawlSource
+from api.services.telemetry import SourceMetrics, bind_metrics
+
+
+@dataclass
+class SourceResult:
+    """How one source's run ended: ok, unchanged (upstream 304), failed or timeout."""
+    name: str
+    status: str
+    rows: int = 0
+    stats: Dict[str, int] = field(default_factory=new_stats)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    metrics: SourceMetrics = field(default_factory=SourceMetrics)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "rows": self.rows,
+            "elapsed": round(self.elapsed, 3),
+            "error": self.error,
+            **self.stats,
+            **self.metrics.summary(self.rows, self.elapsed),
+        }
+
+
+class CrawlExecutor:
+    """
+    Runs crawl sources concurrently under one shared budget.
+
+    All sources share a single CrawlerSession, which caps upstream requests in
+    flight across the whole run (CRAWL_MAX_IN_FLIGHT). Each source is further
+    held to its own `concurrency` and `timeout`, and the run as a whole stops at
+    CRAWL_TIME_LIMIT: sources still going then are cancelled and reported as
+    timed out, keeping whatever they already wrote.
+    """
+    def __init__(self, max_in_flight: Optional[int] = None, time_limit: Optional[float] = None):
+        self.max_in_flight = max_in_flight or settings.CRAWL_MAX_IN_FLIGHT
+        self.time_limit = settings.CRAWL_TIME_LIMIT if time_limit is None else time_limit
+
+    @staticmethod
+    def _bind(sources: List[CrawlSource], session: Optional[CrawlerSession]):
+        for source in sources:
+            source.crawler.session = session
+            source.crawler.slots = asyncio.Semaphore(source.concurrency) if session is not None else None
+
+    async def _run_source(self, source: CrawlSource, result: SourceResult):
+        # Each source runs in its own task, so this only scopes its own requests, parses and writes
+        bind_metrics(result.metrics)
+        started = time.monotonic()
+        try:
+            result.rows = await asyncio.wait_for(source.run(result.stats), timeout=source.timeout)
+            result.status = "ok"
+        except NotModified:
+            result.status = "unchanged"
+        except asyncio.TimeoutError:
+            result.status = "timeout"
+            result.error = f"exceeded {source.timeout:g}s source time limit"
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - started
+
+    async def run(self, sources: List[CrawlSource]) -> List[SourceResult]:
+        results = [SourceResult(name=source.name, status="timeout") for source in sources]
+        if not sources:
+            return results
+
+        async with CrawlerSession(max_in_flight=self.max_in_flight) as session:
+            self._bind(sources, session)
+            tasks = []
+            try:
+                tasks = [
+                    asyncio.create_task(self._run_source(source, result))
+                    for source, result in zip(sources, results)
+                ]
+                _, pending = await asyncio.wait(tasks, timeout=self.time_limit)
+            finally:
+                # Past the time limit, or the run itself was cancelled (e.g. its lease was lost):
+                # stop the sources before their session closes under them
+                unfinished = [task for task in tasks if not task.done()]
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+                self._bind(sources, None)
+
+        for task, result in zip(tasks, results):
+            if task in pending:
+                result.status = "timeout"
+                result.error = f"cancelled at {self.time_limit:g}s run time limit"
+        return results
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from api.core.database import supabase
+
+
+def start_run(run_id: str, owner: str, sources: List[str], job_id: Optional[str] = None):
+    supabase.table("crawl_runs").insert({
+        "id": run_id,
+        "job_id": job_id,
+        "owner": owner,
+        "sources": sources,
+        "status": "running",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }).execute()
+
+
+def finish_run(run_id: str, status: str, summary: Dict[str, Any], **totals):
+    """
+    Close a run. `totals` are the run-wide metric columns (duration_ms, requests, ...).
+    """
+    supabase.table("crawl_runs").update({
+        "status": status,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "summary": summary,
+        **totals,
+    }).eq("id", run_id).execute()
+
+
+def list_runs(limit: int = 20, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    query = supabase.table("crawl_runs").select("*").order("started_at", desc=True).limit(limit)
+    if status:
+        query = query.eq("status", status)
+    return query.execute().data
+
+
+def latest_finished_run() -> Optional[str]:
+    """
+    finished_at of the most recently finished run, whatever its status (failed runs may still have written rows).
+    """
+    res = (
+        supabase.table("crawl_runs").select("finished_at")
+        .neq("status", "running").order("finished_at", desc=True, nullsfirst=False).limit(1).execute()
+    )
+    return res.data[0]["finished_at"] if res.data else None
+
+
+def get_run(run_id: str) -> Optional[Dict[str, Any]]:
+    res = supabase.table("crawl_runs").select("*").eq("id", run_id).execute()
+    return res.data[0] if res.data else None
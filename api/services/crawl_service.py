@@ -0,0 +1,139 @@
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from api.core.database import run_db
+from api.services.crawl_executor import CrawlExecutor
+from api.services.crawl_runs import start_run, finish_run
+from api.services.crawlers import GithubCrawler, ArxivCrawler, HackerNewsCrawler
+from api.services.lease import crawl_lease, LeaseHeld
+from api.services.response_cache import response_cache
+from api.services.scheduler import crawl_scheduler
+from api.services.sources import SOURCE_TYPES
+
+
+class CrawlerService:
+    def __init__(self):
+        self.sources = {name: source_type() for name, source_type in SOURCE_TYPES.items()}
+        self.executor = CrawlExecutor()
+
+    @property
+    def github(self) -> GithubCrawler:
+        return self.sources["github"].crawler
+
+    @property
+    def arxiv(self) -> ArxivCrawler:
+        return self.sources["arxiv"].crawler
+
+    @property
+    def hn(self) -> HackerNewsCrawler:
+        return self.sources["hackernews"].crawler
+
+    async def crawl_all(self, names: Optional[List[str]] = None, job_id: Optional[str] = None):
+        """
+        Run every registered source (or just `names`) through the crawl executor.
+
+        Only one run may be in flight: if another holds the crawl lease, this
+        returns that run's ids instead of starting a second crawl.
+        """
+        run_id = str(uuid.uuid4())
+        try:
+            async with crawl_lease.hold(run_id, job_id) as lease:
+                return await self._run(run_id, lease["owner"], names, job_id)
+        except LeaseHeld as e:
+            print(f"Crawl already running ({e}), attaching to it.")
+            return {
+                "status": "running",
+                "message": "Crawl already in progress",
+                "run_id": e.lease.get("run_id"),
+                "job_id": e.lease.get("job_id"),
+                "attached": True,
+            }
+
+    async def _run(self, run_id: str, owner: str, names: Optional[List[str]], job_id: Optional[str]) -> Dict[str, Any]:
+        print(f"Starting crawl run {run_id}...")
+        sources = [source for name, source in self.sources.items() if names is None or name in names]
+        try:
+            await run_db(start_run, run_id, owner, [s.name for s in sources], job_id)
+        except Exception as e:
+            print(f"Failed to record crawl run start: {e}")
+
+        started = time.monotonic()
+        try:
+            summary = await self._crawl(sources)
+        except BaseException as e:
+            await self._finish(run_id, "failed", {"error": str(e) or type(e).__name__}, time.monotonic() - started)
+            raise
+        summary["run_id"] = run_id
+        await self._finish(run_id, "success", summary, time.monotonic() - started)
+        return summary
+
+    @staticmethod
+    async def _finish(run_id: str, status: str, summary: Dict[str, Any], elapsed: float):
+        # Run-wide totals get their own columns; per-source detail stays in the summary
+        per_source = summary.get("sources", {}).values()
+        totals = {
+            "duration_ms": int(elapsed * 1000),
+            "rows": sum(s["rows"] for s in per_source),
+            "requests": sum(s["requests"] for s in per_source),
+            "bytes_downloaded": sum(s["bytes_downloaded"] for s in per_source),
+            "retries": sum(s["retries"] for s in per_source),
+        }
+        try:
+            await run_db(finish_run, run_id, status, summary, **totals)
+        except Exception as e:
+            print(f"Failed to record crawl run end: {e}")
+        # Failed runs may have written some rows too
+        await response_cache.invalidate()
+
+    async def _crawl(self, sources) -> Dict[str, Any]:
+        results = await self.executor.run(sources)
+
+        # Every run, forced or scheduled, feeds the sources' change rates
+        schedule = {}
+        try:
+            rows = await run_db(crawl_scheduler.record, results)
+            schedule = {row["source"]: row for row in rows}
+        except Exception as e:
+            print(f"Failed to update crawl schedule: {e}")
+
+        unchanged = []
+        for result in results:
+            if result.status == "unchanged":
+                # Upstream answered 304: nothing to parse or write for this source
+                print(f"{result.name} unchanged since last crawl, skipping.")
+                unchanged.append(result.name)
+            elif result.status != "ok":
+                print(f"{result.name} crawler {result.status}: {result.error}")
+            counts = result.stats
+            print(f"{result.name}: {result.rows} crawled in {result.elapsed:.1f}s, "
+                  f"{counts['new']} new, {counts['changed']} changed, {counts['skipped']} unchanged (skipped)")
+            metrics = result.metrics.summary(result.rows, result.elapsed)
+            print(f"{result.name}: {metrics['requests']} requests ({metrics['retries']} retries), "
+                  f"{metrics['bytes_downloaded']} bytes, p95 {metrics['latency_p95_ms']}ms, "
+                  f"parse {metrics['parse_ms']}ms, write {metrics['write_ms']}ms")
+
+        message = "Crawled " + ", ".join(f"{r.rows} {r.name}" for r in results)
+        if unchanged:
+            message += f" ({', '.join(unchanged)} unchanged)"
+        return {
+            "status": "success",
+            "message": message,
+            "stats": {r.name: r.stats for r in results},
+            "sources": {
+                r.name: {**r.summary(), "next_run_at": schedule.get(r.name, {}).get("next_run_at")}
+                for r in results
+            },
+        }
+
+    async def crawl_due(self, job_id: Optional[str] = None):
+        """
+        Run only the sources whose adaptive interval has elapsed (one cron tick).
+        """
+        due = await run_db(crawl_scheduler.due, list(self.sources))
+        if not due:
+            return {"status": "success", "message": "No sources due", "stats": {}, "sources": {}}
+        print(f"Sources due: {', '.join(due)}")
+        return await self.crawl_all(names=due, job_id=job_id)
+
+crawler_service = CrawlerService()
@@ -1,268 +1,556 @@
+import hashlib
 import httpx
-import feedparser
-from bs4 import BeautifulSoup
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, AsyncIterator
+from contextlib import asynccontextmanager, AsyncExitStack, nullcontext
 import asyncio
-from api.core.database import supabase
-import os
+from api.services.http_client import CrawlerSession
+from api.services.http_cache import NotModified
+from api.services.parsers import parse_arxiv_feed, ArxivStreamParser
+from api.services.parse_executor import parse_executor
+from api.core.database import supabase, execute, run_db
+from api.services.categories import category_registry
+from api.services.hn_cache import HNItemCache
+from api.services.checkpoints import load_checkpoint, save_checkpoint
+from api.services.ratelimit import RETRYABLE_STATUS, backoff_delay
+from api.services.telemetry import record_retry, timed
+from api.services.archive import ArchiveWriter, response_archive
+from api.core.config import settings
+
+# Timeouts, connection failures and dropped connections (RemoteProtocolError) are worth another attempt
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.TransportError)
+
+class FetchFailed(Exception):
+    """Raised by fetch_with_retry once retries are exhausted."""
+    def __init__(self, url: str, retries: int, cause: Exception):
+        super().__init__(f"{url} failed after {retries} retries: {cause!r}")
+        self.url = url
+        self.retries = retries
+        self.cause = cause
 
 class BaseCrawler:
-    async def fetch(self, url: str):
-        # Explicitly use trust_env=False to bypass proxy issues if needed, or rely on our global fix
-        # But we already patched create_client, not httpx global.
-        # Let's check environment vars.
-        proxies = None
-        if os.environ.get("HTTP_PROXY"):
-            proxies = os.environ.get("HTTP_PROXY")
-            
-        async with httpx.AsyncClient(verify=False, proxy=proxies) as client:
-            response = await client.get(url, timeout=30.0)
-            return response
+    # Archive partition for this crawler's raw responses; None disables archiving
+    SOURCE: Optional[str] = None
 
-class GithubCrawler(BaseCrawler):
-    async def get_trending(self, language: str = "") -> List[Dict[str, Any]]:
-        url = f"https://github.com/trending/{language}" if language else "https://github.com/trending"
-        print(f"Crawling GitHub Trending: {url}")
-        
+    def __init__(self):
+        # Shared session for the current crawl run, bound by the crawl executor
+        self.session: Optional[CrawlerSession] = None
+        # The owning source's share of the run's request budget, also bound by the executor
+        self.slots: Optional[asyncio.Semaphore] = None
+
+    def _source_slot(self):
+        return self.slots if self.slots is not None else nullcontext()
+
+    async def fetch(self, url: str, conditional: bool = False):
+        """
+        Fetch a URL. `conditional=True` revalidates against the on-disk
+        ETag/Last-Modified cache and raises NotModified on a 304.
+        """
+        if self.session is not None:
+            async with self._source_slot():
+                response = await self.session.get(url, conditional=conditional)
+        else:
+            # Standalone use (scripts, one-off calls): open a short-lived session
+            async with CrawlerSession() as session:
+                response = await session.get(url, conditional=conditional)
+
+        if response.status_code == 200:
+            await self.archive(url, response.content, response.headers.get("content-type"))
+        return response
+
+    async def commit_validators(self, url: str):
+        """
+        Keep the validators of a conditional fetch() of `url` now that its data is stored.
+        Standalone fetches have no session to hold them, so they never revalidate.
+        """
+        if self.session is not None:
+            await self.session.commit_validators(url)
+
+    async def archive(self, url: str, body: bytes, content_type: Optional[str] = None):
+        """
+        Keep the raw body in the response archive so it can be re-parsed offline later.
+        """
+        if self.SOURCE is None or not response_archive.enabled:
+            return
         try:
-            response = await self.fetch(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            rows = soup.select('article.Box-row')
-            
-            projects = []
-            for row in rows:
-                try:
-                    # Get repo name and link
-                    h1 = row.select_one('h2.h3 a')
-                    if not h1:
-                        continue
-                        
-                    full_name = h1.get_text(strip=True).replace(' ', '').replace('\n', '')
-                    repo_url = f"https://github.com{h1['href']}"
-                    repo_id = h1['href'].strip('/') # Simple ID
-                    
-                    parts = full_name.split('/')
-                    name = parts[1] if len(parts) > 1 else full_name
-                    
-                    # Description
-                    desc_elem = row.select_one('p.col-9')
-                    description = desc_elem.get_text(strip=True) if desc_elem else None
-                    
-                    # Language
-                    lang_elem = row.select_one('span[itemprop="programmingLanguage"]')
-                    language_val = lang_elem.get_text(strip=True) if lang_elem else None
-                    
-                    # Stars and Forks
-                    stats = row.select('a.Link--muted')
-                    stars_str = stats[0].get_text(strip=True).replace(',', '') if len(stats) > 0 else "0"
-                    forks_str = stats[1].get_text(strip=True).replace(',', '') if len(stats) > 1 else "0"
-                    
-                    stars = int(stars_str)
-                    forks = int(forks_str)
-                    
-                    project = {
-                        "repo_id": repo_id,
-                        "name": name,
-                        "full_name": full_name,
-                        "description": description,
-                        "language": language_val,
-                        "stars": stars,
-                        "forks": forks,
-                        "url": repo_url,
-                        "trending_date": date.today().isoformat()
-                    }
-                    projects.append(project)
-                except Exception as e:
-                    print(f"Error parsing row: {e}")
-                    continue
-                    
-            return projects
+            await asyncio.to_thread(response_archive.put, self.SOURCE, url, body, content_type)
+        except Exception as e:
+            # Losing an archive copy must never fail the crawl
+            print(f"Failed to archive {url}: {e}")
+
+    async def archive_writer(self, url: str, content_type: Optional[str] = None) -> Optional[ArchiveWriter]:
+        """
+        Start archiving a body that is read in chunks. None if archiving is off or fails to start.
+        """
+        if self.SOURCE is None or not response_archive.enabled:
+            return None
+        try:
+            return await asyncio.to_thread(response_archive.writer, self.SOURCE, url, content_type)
         except Exception as e:
-            print(f"Error crawling GitHub: {e}")
-            return []
+            print(f"Failed to archive {url}: {e}")
+            return None
+
+    @asynccontextmanager
+    async def stream(self, url: str, conditional: bool = False):
+        """
+        Open a streaming GET, retrying 429/5xx, timeouts and connection errors
+        before any of the body is consumed, as fetch_with_retry does.
+        With `conditional=True` a 304 raises NotModified, as with fetch().
+        """
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as stack:
+                if self.session is None:
+                    # Standalone use: the session lives as long as the stream
+                    session = await stack.enter_async_context(CrawlerSession())
+                else:
+                    session = self.session
+                    await stack.enter_async_context(self._source_slot())
+                try:
+                    response = await stack.enter_async_context(session.stream(url, conditional=conditional))
+                except RETRYABLE_ERRORS:
+                    if attempt >= settings.CRAWLER_MAX_RETRIES:
+                        raise
+                    delay = backoff_delay(attempt)
+                else:
+                    if response.status_code in RETRYABLE_STATUS and attempt < settings.CRAWLER_MAX_RETRIES:
+                        delay = backoff_delay(attempt, response)
+                    else:
+                        # Errors once the body is being read are the caller's; no retry from here
+                        response.raise_for_status()
+                        yield response
+                        return
+            await asyncio.sleep(delay)
+            attempt += 1
+            record_retry()
+
+    async def fetch_with_retry(self, url: str, max_retries: Optional[int] = None, conditional: bool = False) -> Tuple[httpx.Response, int]:
+        """
+        Fetch with jittered exponential backoff on 429/5xx and timeouts.
+        Returns the response and the number of retries it took; raises FetchFailed otherwise.
+        With `conditional=True` a 304 raises NotModified, as with fetch().
+        """
+        max_retries = settings.CRAWLER_MAX_RETRIES if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            try:
+                response = await self.fetch(url, conditional=conditional)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= max_retries:
+                    raise FetchFailed(url, attempt, e)
+                await asyncio.sleep(backoff_delay(attempt))
+            else:
+                if response.status_code not in RETRYABLE_STATUS or attempt >= max_retries:
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as e:
+                        raise FetchFailed(url, attempt, e)
+                    return response, attempt
+                await asyncio.sleep(backoff_delay(attempt, response))
+            attempt += 1
+            record_retry()
+
+class GithubCrawler(BaseCrawler):
+    SOURCE = "github"
+    WINDOWS = ("daily", "weekly", "monthly")
+
+    @staticmethod
+    def trending_url(language: str = "", since: str = "daily") -> str:
+        url = f"https://github.com/trending/{language}" if language else "https://github.com/trending"
+        if since != "daily":
+            url += f"?since={since}"
+        return url
+
+    def trending_cells(
+        self,
+        languages: Optional[List[str]] = None,
+        windows: Optional[List[str]] = None,
+        max_requests: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        The (language, window) pages to crawl, capped at `max_requests`.
+        """
+        languages = settings.GITHUB_TRENDING_LANGUAGES if languages is None else languages
+        windows = settings.GITHUB_TRENDING_WINDOWS if windows is None else windows
+        max_requests = max_requests or settings.GITHUB_CRAWL_MAX_REQUESTS
+
+        cells = [(lang, since) for since in windows if since in self.WINDOWS for lang in languages]
+        if len(cells) > max_requests:
+            print(f"GitHub matrix has {len(cells)} pages, budget allows {max_requests}; dropping the rest")
+            cells = cells[:max_requests]
+        return cells
 
 class ArxivCrawler(BaseCrawler):
-    async def get_cv_papers(self, max_results: int = 20) -> List[Dict[str, Any]]:
-        # CS.CV is Computer Vision
-        url = f"http://export.arxiv.org/api/query?search_query=cat:cs.CV&start=0&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
-        print(f"Crawling ArXiv: {url}")
-        
+    SOURCE = "arxiv"
+
+    def _category_id(self, arxiv_category: str) -> Optional[str]:
+        """
+        Map an arXiv category (cs.CV) to a categories row, creating it if missing.
+        """
+        slug = settings.ARXIV_CATEGORY_SLUGS.get(arxiv_category) or f"arxiv-{arxiv_category.lower().replace('.', '-')}"
+        return category_registry.ensure(
+            slug,
+            name=f"arXiv {arxiv_category}",
+            description=f"Latest {arxiv_category} submissions on arXiv",
+        )
+
+    async def ingest(
+        self,
+        sink: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        categories: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """
+        Incrementally ingest every configured category. Returns the number of papers handed to `sink`.
+        """
+        categories = settings.ARXIV_CATEGORIES if categories is None else categories
+        total = 0
+
+        # Count at the sink so pages written before a failure are still reported
+        async def counting_sink(papers):
+            nonlocal total
+            await sink(papers)
+            total += len(papers)
+
+        for category in categories:
+            try:
+                await self.ingest_category(category, counting_sink, since=since, max_pages=max_pages)
+            except Exception as e:
+                # The checkpoint keeps the paging position, the next run resumes from it
+                print(f"ArXiv ingest of {category} stopped: {e}")
+        return total
+
+    async def ingest_category(
+        self,
+        category: str,
+        sink: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        since: Optional[datetime] = None,
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """
+        Page newest-first through one category until reaching the last-seen
+        submittedDate checkpoint (or `since`, for backfills).
+
+        Each page goes to `sink` before the paging position is checkpointed, so a
+        failed run resumes at the page it stopped on. Request spacing comes from
+        the arXiv rate limit in CRAWLER_HOST_RATES.
+        """
+        page_size = settings.ARXIV_PAGE_SIZE
+        max_pages = max_pages or settings.ARXIV_MAX_PAGES
+
+        def parse_ts(value):
+            return datetime.fromisoformat(value) if value else None
+
+        checkpoint = await run_db(load_checkpoint, "arxiv", category)
+        last_seen = parse_ts(checkpoint.get("last_seen"))
+        start = checkpoint.get("resume_start") or 0
+        high_water = parse_ts(checkpoint.get("resume_high_water")) or last_seen
+
+        # An interrupted run keeps the floor it started with, so a resumed backfill still reaches back far enough
+        floor = (
+            since
+            or (parse_ts(checkpoint.get("resume_floor")) if start else None)
+            or last_seen
+            or datetime.now(timezone.utc) - timedelta(days=settings.ARXIV_INITIAL_LOOKBACK_DAYS)
+        )
+        if start:
+            print(f"Resuming ArXiv {category} at offset {start}")
+
+        category_id = await run_db(self._category_id, category)
+        ingested = 0
+        finished = False
+        first_start = start
+        # A regular run revalidates the newest page: a 304 means nothing was submitted since the last
+        # run that caught up. Resumed runs and backfills need the pages whatever their validators say.
+        revalidate = start == 0 and since is None and last_seen is not None
+        first_url = None
+        for _ in range(max_pages):
+            url = (
+                f"http://export.arxiv.org/api/query?search_query=cat:{category}&start={start}"
+                f"&max_results={page_size}&sortBy=submittedDate&sortOrder=descending"
+            )
+            print(f"Crawling ArXiv: {url}")
+            conditional = revalidate and first_url is None
+            first_url = first_url or url
+            try:
+                seen, fresh, high_water = await self._ingest_page(url, floor, high_water, category_id, sink, conditional)
+            except NotModified:
+                print(f"ArXiv {category} unchanged since last crawl")
+                return 0
+            if not seen:
+                if start == first_start:
+                    # Nothing at all to page through: caught up
+                    finished = True
+                # Otherwise arXiv returned an empty page partway through, which it sometimes does.
+                # Older papers may still be unread, so the checkpoint saved after the last page stays.
+                break
+            ingested += fresh
+            start += seen
+
+            # Reached papers we already have: this category is caught up
+            if fresh < seen:
+                finished = True
+                break
+            await run_db(
+                save_checkpoint, "arxiv", category,
+                resume_start=start,
+                resume_high_water=high_water.isoformat(),
+                resume_floor=floor.isoformat(),
+            )
+
+        if finished:
+            if last_seen and high_water and last_seen > high_water:
+                high_water = last_seen
+            await run_db(
+                save_checkpoint, "arxiv", category,
+                last_seen=high_water.isoformat() if high_water else None,
+                resume_start=None,
+                resume_high_water=None,
+                resume_floor=None,
+            )
+            # Only now is everything the newest page led to stored, so it may be answered with a 304 next time
+            if revalidate:
+                await self.commit_validators(first_url)
+        else:
+            print(f"ArXiv {category} not caught up, will resume at offset {start}")
+
+        print(f"Ingested {ingested} new ArXiv {category} papers.")
+        return ingested
+
+    async def _page_entries(self, url: str, conditional: bool = False) -> AsyncIterator[Tuple[Dict[str, Any], str]]:
+        """
+        Yield (paper, submitted_at) pairs for one result page, newest first.
+        Streaming mode parses the Atom body chunk by chunk as it downloads.
+        With `conditional=True` a 304 raises NotModified.
+        """
+        if not settings.ARXIV_STREAMING:
+            response, _ = await self.fetch_with_retry(url, conditional=conditional)
+            for entry in await parse_executor.run(parse_arxiv_feed, response.text, True):
+                yield entry
+            return
+
+        parser = ArxivStreamParser()
+        archive = None
         try:
-            # feedparser handles XML fetching and parsing, but it's synchronous. 
-            # We can use it with the raw content from httpx if we want async, or run it in executor.
-            # Here for simplicity we fetch with httpx then parse string.
-            response = await self.fetch(url)
-            feed = feedparser.parse(response.text)
-            
-            papers = []
-            
-            # Get category ID for 'Computer Vision'
-            # In a real app we might cache this or look it up properly
-            cats = supabase.table("categories").select("id").eq("slug", "object-detection").execute()
-            # Fallback if specific category not found (just use first one or None)
-            category_id = cats.data[0]['id'] if cats.data else None
-            
-            if not category_id:
-                # Try to get any category or create one
-                cats = supabase.table("categories").select("id").limit(1).execute()
-                category_id = cats.data[0]['id'] if cats.data else None
-
-            for entry in feed.entries:
+            async with self.stream(url, conditional=conditional) as response:
+                archive = await self.archive_writer(url, response.headers.get("content-type"))
+                async for chunk in response.aiter_bytes():
+                    if archive is not None:
+                        try:
+                            await asyncio.to_thread(archive.write, chunk)
+                        except Exception as e:
+                            print(f"Failed to archive {url}: {e}")
+                            archive.abort()
+                            archive = None
+                    with timed("parse_time"):
+                        entries = parser.feed(chunk)
+                    for entry in entries:
+                        yield entry
+            with timed("parse_time"):
+                entries = parser.close()
+            for entry in entries:
+                yield entry
+        finally:
+            # A page abandoned at the first already-seen paper is archived truncated,
+            # which still re-parses to exactly the entries that were ingested
+            if archive is not None:
                 try:
-                    # Extract authors
-                    authors = [author.name for author in entry.authors]
-                    
-                    # Extract PDF link
-                    pdf_url = None
-                    for link in entry.links:
-                        if link.type == 'application/pdf':
-                            pdf_url = link.href
-                            
-                    paper = {
-                        "title": entry.title.replace('\n', ' '),
-                        "abstract": entry.summary.replace('\n', ' '),
-                        "authors": authors,
-                        "pdf_url": pdf_url,
-                        "published_date": datetime(*entry.published_parsed[:6]).date().isoformat(),
-                        "source": "arxiv",
-                        "category_id": category_id
-                    }
-                    papers.append(paper)
+                    await asyncio.to_thread(archive.close)
                 except Exception as e:
-                    print(f"Error parsing paper: {e}")
-                    continue
-                    
-            return papers
-        except Exception as e:
-            print(f"Error crawling ArXiv: {e}")
-            return []
+                    print(f"Failed to archive {url}: {e}")
+
+    async def _ingest_page(self, url, floor, high_water, category_id, sink, conditional=False) -> Tuple[int, int, Optional[datetime]]:
+        """
+        Hand one page's papers newer than `floor` to `sink` in batches, as they are parsed.
+        Stops reading at the first already-seen paper. Returns (seen, fresh, high_water).
+        """
+        seen = 0
+        fresh = 0
+        batch = []
+        entries = self._page_entries(url, conditional)
+        try:
+            async for paper, submitted_at in entries:
+                seen += 1
+                submitted_at = datetime.fromisoformat(submitted_at)
+                if high_water is None or submitted_at > high_water:
+                    high_water = submitted_at
+                if submitted_at <= floor:
+                    # Results are newest first, the rest of the page is older still
+                    break
+                paper["category_id"] = category_id
+                batch.append(paper)
+                fresh += 1
+                if len(batch) >= settings.ARXIV_WRITE_BATCH:
+                    await sink(batch)
+                    batch = []
+        finally:
+            await entries.aclose()
+        if batch:
+            await sink(batch)
+        return seen, fresh, high_water
 
 class HackerNewsCrawler(BaseCrawler):
     """
     Crawls Hacker News top stories.
+
+    Items are cached by id (HNItemCache). A run only refetches stories that
+    v0/updates.json reports as changed, new entrants to topstories and cache
+    entries past their TTL.
     """
-    async def get_top_stories(self, limit: int = 20) -> List[Dict[str, Any]]:
-        top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        print(f"Crawling Hacker News: {top_stories_url}")
-        
+    SOURCE = "hackernews"
+    API = "https://hacker-news.firebaseio.com/v0"
+    TOP_STORIES_URL = f"{API}/topstories.json"
+
+    def __init__(self):
+        super().__init__()
+        self.cache = HNItemCache()
+        # Items refetched this run, and how many retries those that needed any took (a failed item's count too)
+        self.refetched = 0
+        self.retried: Dict[int, int] = {}
+
+    @staticmethod
+    def _to_paper(item: Optional[Dict[str, Any]], category_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not item or item.get('type') != 'story':
+            return None
+        return {
+            "title": item.get('title'),
+            "abstract": f"Score: {item.get('score', 0)} | Comments: {item.get('descendants', 0)}",
+            "authors": [item.get('by', 'unknown')],
+            "pdf_url": item.get('url', f"https://news.ycombinator.com/item?id={item['id']}"), 
+            "published_date": datetime.fromtimestamp(item.get('time')).date().isoformat(),
+            "source": "hackernews", 
+            "external_id": str(item['id']),
+            "score": item.get('score', 0),
+            "comments": item.get('descendants', 0),
+            "category_id": category_id
+        }
+
+    def _category_id(self) -> str:
+        return category_registry.ensure(
+            "hacker-news",
+            name="Hacker News",
+            description="Top stories from Hacker News",
+        )
+
+    async def _changed_ids(self) -> set:
+        """
+        Ids HN reports as recently changed. An empty set on failure: the cache TTL still bounds staleness.
+        """
         try:
-            response = await self.fetch(top_stories_url)
-            story_ids = response.json()[:limit]
-            
-            papers = []
-            
-            # Get a category for HN
-            cats = supabase.table("categories").select("id").eq("slug", "hacker-news").execute()
-            if not cats.data:
-                res = supabase.table("categories").insert({
-                    "name": "Hacker News", 
-                    "slug": "hacker-news", 
-                    "description": "Top stories from Hacker News"
-                }).execute()
-                category_id = res.data[0]['id']
+            response, _ = await self.fetch_with_retry(f"{self.API}/updates.json")
+            return set(response.json().get("items", []))
+        except Exception as e:
+            print(f"Error fetching HN updates: {e}")
+            return set()
+
+    async def top_story_ids(self, limit: Optional[int] = None) -> List[int]:
+        """
+        Current topstories ids, or the cached list if it hasn't changed (304).
+        A failed fetch or a body that isn't a list of ids also keeps the cached list.
+        """
+        limit = limit or settings.HN_TOP_LIMIT
+        print(f"Crawling Hacker News: {self.TOP_STORIES_URL}")
+        try:
+            # Only revalidate when we still have the previous list to fall back on
+            response, _ = await self.fetch_with_retry(self.TOP_STORIES_URL, conditional=bool(self.cache.top_ids))
+        except NotModified:
+            print("HN topstories unchanged, checking updated items only")
+        except FetchFailed as e:
+            if not self.cache.top_ids:
+                raise
+            print(f"Error fetching HN topstories after {e.retries} retries, using the previous list: {e.cause}")
+        else:
+            try:
+                ids = response.json()
+            except ValueError:
+                ids = None
+            if isinstance(ids, list) and all(type(sid) is int for sid in ids):
+                self.cache.top_ids = ids
             else:
-                category_id = cats.data[0]['id']
-            
-            # Fetch details concurrently
-            tasks = []
-            for sid in story_ids:
-                item_url = f"https://hacker-news.firebaseio.com/v0/item/{sid}.json"
-                tasks.append(self.fetch(item_url))
-            
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for i, item_resp in enumerate(responses):
-                if isinstance(item_resp, Exception):
-                    print(f"Error fetching HN item {story_ids[i]}: {item_resp}")
-                    continue
+                print("HN topstories response is not a list of ids, using the previous list")
+                # Don't let a 304 pin the bad response on the next run
+                if self.session is not None:
+                    self.session.pending_validators.pop(self.TOP_STORIES_URL, None)
+        return self.cache.top_ids[:limit]
 
-                try:
-                    item = item_resp.json()
-                    
-                    if not item or item.get('type') != 'story':
-                        continue
-                        
-                    paper = {
-                        "title": item.get('title'),
-                        "abstract": f"Score: {item.get('score', 0)} | Comments: {item.get('descendants', 0)}",
-                        "authors": [item.get('by', 'unknown')],
-                        "pdf_url": item.get('url', f"https://news.ycombinator.com/item?id={story_ids[i]}"), 
-                        "published_date": datetime.fromtimestamp(item.get('time')).date().isoformat(),
-                        "source": "hackernews", 
-                        "category_id": category_id
-                    }
-                    papers.append(paper)
-                except Exception as e:
-                    print(f"Error parsing HN story {story_ids[i]}: {e}")
-                    continue
-            
-            return papers
+    async def recent_story_ids(self, exclude: Optional[set] = None) -> List[int]:
+        """
+        Stored stories young enough (HN_REFRESH_MAX_AGE_HOURS) to keep their scores live.
+        """
+        max_age = settings.HN_REFRESH_MAX_AGE_HOURS * 3600
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).date().isoformat()
+        exclude = exclude or set()
+        res = await execute(
+            supabase.table("papers").select("external_id")
+            .eq("source", "hackernews").gte("published_date", cutoff)
+        )
+        # Rows still keyed on their story URL (see adopt_legacy_rows) have no item id to refresh
+        return [
+            int(r["external_id"]) for r in res.data
+            if r.get("external_id") and r["external_id"].isdigit() and r["external_id"] not in exclude
+        ]
 
-        except Exception as e:
-            print(f"Error crawling Hacker News: {e}")
-            return []
+    @staticmethod
+    def legacy_key(url: str) -> str:
+        # The external_id the papers natural-key migration gave stories it had no item id for
+        return "url:" + hashlib.md5(url.encode("utf-8")).hexdigest()
 
-class CrawlerService:
-    def __init__(self):
-        self.github = GithubCrawler()
-        self.arxiv = ArxivCrawler()
-        self.hn = HackerNewsCrawler()
-
-    async def crawl_all(self):
-        print("Starting full crawl...")
-        
-        # Run all crawlers concurrently
-        # GitHub and ArXiv are independent. HN is independent.
-        # We can gather them.
-        
-        results = await asyncio.gather(
-            self.github.get_trending(),
-            self.arxiv.get_cv_papers(),
-            self.hn.get_top_stories(),
-            return_exceptions=True
+    async def has_legacy_rows(self) -> bool:
+        res = await execute(
+            supabase.table("papers").select("id")
+            .eq("source", "hackernews").like("external_id", "url:%").limit(1)
         )
-        
-        projects = results[0] if not isinstance(results[0], Exception) else []
-        if isinstance(results[0], Exception):
-            print(f"GitHub crawler failed: {results[0]}")
-
-        papers = results[1] if not isinstance(results[1], Exception) else []
-        if isinstance(results[1], Exception):
-            print(f"ArXiv crawler failed: {results[1]}")
-
-        hn_items = results[2] if not isinstance(results[2], Exception) else []
-        if isinstance(results[2], Exception):
-            print(f"HN crawler failed: {results[2]}")
-
-        # Save results (sequentially to avoid DB locks/issues, or could be parallel too but let's be safe)
-        
-        # 1. GitHub
-        for p in projects:
-            try:
-                supabase.table("github_projects").upsert(p, on_conflict="repo_id").execute()
-            except Exception as e:
-                print(f"Failed to save project {p['name']}: {e}")
-        print(f"Saved {len(projects)} GitHub projects.")
+        return bool(res.data)
 
-        # 2. ArXiv
-        for p in papers:
-            try:
-                supabase.table("papers").insert(p).execute()
-            except Exception as e:
-                # print(f"Failed to save paper {p['title']}: {e}")
-                pass # Ignore duplicate inserts for now
-        print(f"Saved {len(papers)} ArXiv papers.")
-        
-        # 3. Hacker News
-        for n in hn_items:
+    async def adopt_legacy_rows(self, papers: List[Dict[str, Any]]):
+        """
+        Move stored rows keyed on their story URL onto the item id, so upserting `papers` updates them.
+        """
+        keys = {self.legacy_key(p["pdf_url"]): p["external_id"] for p in papers if p.get("pdf_url")}
+        if not keys:
+            return
+        res = await execute(
+            supabase.table("papers").select("external_id")
+            .eq("source", "hackernews").in_("external_id", list(keys))
+        )
+        for row in res.data:
+            await execute(
+                supabase.table("papers").update({"external_id": keys[row["external_id"]]})
+                .eq("source", "hackernews").eq("external_id", row["external_id"])
+            )
+
+    @staticmethod
+    def is_recent(item: Optional[Dict[str, Any]]) -> bool:
+        horizon = datetime.now().timestamp() - settings.HN_REFRESH_MAX_AGE_HOURS * 3600
+        return bool(item) and item.get('time', 0) >= horizon
+
+    async def get_item(self, sid: int, changed: set) -> Optional[Dict[str, Any]]:
+        """
+        One item: from the cache while fresh and unchanged, otherwise refetched into it.
+        If the refetch fails the cached copy, if any, is used.
+        """
+        if sid in changed or not self.cache.is_fresh(sid):
+            self.refetched += 1
             try:
-                supabase.table("papers").insert(n).execute()
-            except Exception as e:
-                # print(f"Failed to save HN item {n['title']}: {e}")
-                pass
-        print(f"Saved {len(hn_items)} HN items.")
-        
-        return {"status": "success", "message": f"Crawled {len(projects)} projects, {len(papers)} papers, {len(hn_items)} HN items"}
+                response, retries = await self.fetch_with_retry(f"{self.API}/item/{sid}.json")
+            except FetchFailed as e:
+                self.retried[sid] = e.retries
+                print(f"Error fetching HN item {sid} after {e.retries} retries: {e.cause}")
+                return self.cache.get(sid)
+            if retries:
+                self.retried[sid] = retries
+            item = response.json()
+            if item:
+                self.cache.put(sid, item)
+        return self.cache.get(sid)
 
-crawler_service = CrawlerService()
+    def report(self, items: int):
+        """
+        Log this run's refetches and the items that needed retries, then reset the counts.
+        """
+        print(f"HN: refetched {self.refetched} of {items} stories")
+        if self.retried:
+            print(f"HN items needing retries: {', '.join(f'{sid}x{n}' for sid, n in self.retried.items())}")
+        self.refetched = 0
+        self.retried = {}
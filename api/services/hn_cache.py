@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from api.core.config import settings
+from api.services.http_cache import default_cache_dir
+
+
+class HNItemCache:
+    """
+    Hacker News items keyed by id, each with the time it was fetched.
+
+    Entries are fresh for HN_ITEM_CACHE_TTL seconds; older ones are refetched.
+    The cache also remembers the last topstories list so new entrants can be
+    spotted. It is snapshotted to a JSON file in the crawler cache directory.
+    """
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path or os.path.join(default_cache_dir(), "hn_items.json")
+        self.ttl = settings.HN_ITEM_CACHE_TTL if ttl is None else ttl
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.top_ids: List[int] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.items = data.get("items", {})
+            self.top_ids = data.get("top_ids", [])
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        # Keep only items young enough to still matter for score refreshes
+        horizon = time.time() - settings.HN_REFRESH_MAX_AGE_HOURS * 3600
+        top = {str(i) for i in self.top_ids}
+        with self._lock:
+            self.items = {
+                k: v for k, v in self.items.items()
+                if v["item"].get("time", 0) >= horizon or k in top
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"items": self.items, "top_ids": self.top_ids}, f)
+            os.replace(tmp, self.path)
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        entry = self.items.get(str(item_id))
+        return entry["item"] if entry else None
+
+    def is_fresh(self, item_id: int) -> bool:
+        entry = self.items.get(str(item_id))
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, item_id: int, item: Dict[str, Any]):
+        self.items[str(item_id)] = {"item": item, "fetched_at": time.time()}
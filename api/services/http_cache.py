@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from api.core.config import settings, local_data_dir
+
+
+class NotModified(Exception):
+    """
+    Raised by a conditional fetch when the upstream answered 304.
+    Crawlers let it propagate so CrawlerService can skip the source entirely.
+    """
+    def __init__(self, url: str):
+        super().__init__(f"Not modified: {url}")
+        self.url = url
+
+
+def default_cache_dir() -> str:
+    return local_data_dir(settings.CRAWLER_CACHE_DIR, "http")
+
+
+class HttpValidatorCache:
+    """
+    Disk-backed store of ETag / Last-Modified validators per URL.
+
+    Each URL gets a `<sha256>.json` metadata file. Total size is bounded;
+    least recently used entries (by mtime) are evicted first. Validators are
+    only worth keeping once the response they came from has been stored, so
+    callers put() them after that, not when the response arrives.
+    """
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = settings.CRAWLER_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            # Touch the file so eviction sees this entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        meta = self.get(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        if not etag and not last_modified:
+            return
+
+        path = self._path(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        with self._lock:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp, path)
+
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".body"):
+                # Left over from when the last body was cached alongside its validators
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".json"):
+                continue
+            try:
+                size = os.path.getsize(path)
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            entries.append((mtime, size, path))
+            total += size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,308 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager, contextmanager
+import socket
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from api.core.config import settings
+from api.services.http_cache import HttpValidatorCache, NotModified
+from api.services.ratelimit import HostRateLimiter
+from api.services.telemetry import record_request
+
+
+class DNSCache:
+    """
+    Tiny TTL cache in front of getaddrinfo so a crawl run resolves each host once.
+    """
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = asyncio.Lock()
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = self._entries.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        async with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = []
+            for info in infos:
+                address = info[4][0]
+                if address not in addresses:
+                    addresses.append(address)
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            return addresses
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects to DNS-cached addresses.
+    TLS still uses the original hostname for SNI, httpcore passes it to start_tls separately.
+    """
+    def __init__(self, dns_cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.dns_cache = dns_cache
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self.dns_cache.resolve(host, port)
+        except socket.gaierror:
+            addresses = [host]
+
+        last_error = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+@contextmanager
+def _httpx_errors() -> Iterator[None]:
+    """
+    Re-raise httpcore exceptions as their httpx namesakes (ConnectError, ReadTimeout, ...),
+    which is what callers' retry logic catches.
+    """
+    try:
+        yield
+    except httpcore.TimeoutException as e:
+        raise getattr(httpx, type(e).__name__, httpx.TimeoutException)(str(e)) from e
+    except httpcore.NetworkError as e:
+        raise getattr(httpx, type(e).__name__, httpx.NetworkError)(str(e)) from e
+    except httpcore.ProtocolError as e:
+        raise getattr(httpx, type(e).__name__, httpx.ProtocolError)(str(e)) from e
+    except httpcore.ProxyError as e:
+        raise httpx.ProxyError(str(e)) from e
+    except httpcore.UnsupportedProtocol as e:
+        raise httpx.UnsupportedProtocol(str(e)) from e
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def __aiter__(self):
+        with _httpx_errors():
+            async for chunk in self.stream:
+                yield chunk
+
+    async def aclose(self):
+        if hasattr(self.stream, "aclose"):
+            await self.stream.aclose()
+
+
+class DNSCachingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport whose connections go through CachingNetworkBackend.
+
+    httpx.AsyncHTTPTransport has no way to choose the network backend, so this
+    builds the httpcore connection pool itself (httpcore takes `network_backend`
+    publicly) and does the small httpx <-> httpcore request/response translation.
+    """
+    def __init__(
+        self,
+        dns_cache: DNSCache,
+        verify: bool = True,
+        http2: bool = False,
+        limits: httpx.Limits = httpx.Limits(),
+        proxy: Optional[str] = None,
+        retries: int = 0,
+    ):
+        ssl_context = httpx.create_ssl_context(verify=verify)
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=ssl_context,
+            proxy=httpcore.Proxy(proxy, ssl_context=ssl_context) if proxy else None,
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            retries=retries,
+            network_backend=CachingNetworkBackend(dns_cache),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            response = await self.pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
+
+
+class CrawlerSession:
+    """
+    Shared HTTP client for one crawl run.
+
+    Wraps a single pooled httpx.AsyncClient (keep-alive, HTTP/2 where the server
+    negotiates it), caps the number of in-flight requests overall and per host,
+    and paces requests per host through a token bucket.
+    """
+    def __init__(
+        self,
+        proxy: Optional[str] = None,
+        verify: Optional[bool] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        max_connections_per_host: Optional[int] = None,
+        validator_cache: Optional[HttpValidatorCache] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.proxy = proxy or settings.CRAWLER_PROXY or os.environ.get("HTTP_PROXY")
+        self.verify = settings.CRAWLER_VERIFY_SSL if verify is None else verify
+        self.http2 = settings.CRAWLER_HTTP2 if http2 is None else http2
+        self.timeout = settings.CRAWLER_TIMEOUT if timeout is None else timeout
+        self.max_connections_per_host = max_connections_per_host or settings.CRAWLER_MAX_CONNECTIONS_PER_HOST
+        self.dns_cache = DNSCache(ttl=settings.CRAWLER_DNS_CACHE_TTL)
+        self.validator_cache = validator_cache
+        if self.validator_cache is None and settings.CRAWLER_HTTP_CACHE:
+            self.validator_cache = HttpValidatorCache()
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # url -> (etag, last_modified) of conditional 200s not yet committed
+        self.pending_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight = asyncio.Semaphore(max_in_flight or settings.CRAWL_MAX_IN_FLIGHT)
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.CRAWLER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CRAWLER_MAX_KEEPALIVE,
+            keepalive_expiry=settings.CRAWLER_KEEPALIVE_EXPIRY,
+        )
+        transport = DNSCachingTransport(
+            self.dns_cache,
+            verify=self.verify,
+            http2=self.http2,
+            limits=limits,
+            proxy=self.proxy,
+            retries=1,
+        )
+
+        timeout = httpx.Timeout(self.timeout, connect=settings.CRAWLER_CONNECT_TIMEOUT)
+        return httpx.AsyncClient(transport=transport, timeout=timeout, follow_redirects=True)
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_slots[host]
+
+    async def __aenter__(self) -> "CrawlerSession":
+        self.client = self._build_client()
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        client, self.client = self.client, None
+        if client is not None:
+            await client.__aexit__(*exc_info)
+
+    async def get(self, url: str, conditional: bool = False, **kwargs) -> httpx.Response:
+        """
+        GET a URL through the shared client.
+        With `conditional=True` the cached validators are sent and a 304 raises NotModified.
+        """
+        if self.client is None:
+            raise RuntimeError("CrawlerSession used outside of 'async with'")
+
+        conditional = conditional and self.validator_cache is not None
+        if conditional:
+            await self._add_validators(url, kwargs)
+
+        await self.rate_limiter.acquire(url)
+        async with self._slot(url), self.in_flight:
+            started = time.perf_counter()
+            response = await self.client.get(url, **kwargs)
+            record_request(time.perf_counter() - started, response.num_bytes_downloaded)
+
+        if conditional:
+            self._check_validators(url, response)
+        return response
+
+    async def _add_validators(self, url: str, kwargs: Dict):
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(await asyncio.to_thread(self.validator_cache.conditional_headers, url))
+        kwargs["headers"] = headers
+
+    def _check_validators(self, url: str, response: httpx.Response):
+        if response.status_code == 304:
+            raise NotModified(url)
+        if response.status_code == 200:
+            # Held back until the caller has stored what it parsed (commit_validators):
+            # a 304 for a response that never made it into the database would lose it for good
+            self.pending_validators[url] = (response.headers.get("etag"), response.headers.get("last-modified"))
+
+    async def commit_validators(self, url: str):
+        """
+        Store the validators of the last conditional 200 for `url`, once its data is safely written.
+        """
+        pending = self.pending_validators.pop(url, None)
+        if pending is not None and self.validator_cache is not None:
+            await asyncio.to_thread(self.validator_cache.put, url, *pending)
+
+    @asynccontextmanager
+    async def stream(self, url: str, conditional: bool = False, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming GET: the body is read by the caller in chunks instead of buffered.
+        The host slot is held until the caller leaves the block.
+        `conditional` works as for get(): a 304 raises NotModified on entering the block.
+        """
+        if self.client is None:
+            raise RuntimeError("CrawlerSession used outside of 'async with'")
+
+        conditional = conditional and self.validator_cache is not None
+        if conditional:
+            await self._add_validators(url, kwargs)
+
+        await self.rate_limiter.acquire(url)
+        async with self._slot(url), self.in_flight:
+            started = time.perf_counter()
+            async with self.client.stream("GET", url, **kwargs) as response:
+                # Latency is time to response headers; the bytes are counted once the body is read
+                latency = time.perf_counter() - started
+                try:
+                    if conditional:
+                        self._check_validators(url, response)
+                    yield response
+                finally:
+                    record_request(latency, response.num_bytes_downloaded)
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from celery import Celery
+from celery.result import AsyncResult
+
+from api.core.config import settings
+from api.services.lease import crawl_queue
+
+# Longest a crawl job may run. Enforced inside the task: the solo pool the worker
+# uses has no way to interrupt a task from outside, so soft_time_limit would never fire.
+JOB_TIME_LIMIT = settings.CRAWL_TIME_LIMIT + 60
+
+
+def _result_backend() -> str:
+    if settings.CELERY_RESULT_BACKEND:
+        return settings.CELERY_RESULT_BACKEND
+    # Eager jobs run in this process, so their results can stay here too: no Redis needed
+    return "cache+memory://" if settings.CELERY_TASK_ALWAYS_EAGER else settings.REDIS_URL
+
+
+celery_app = Celery(
+    "techvision",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    backend=_result_backend(),
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    # Ack only once the crawl finished, so a job whose worker dies is redelivered instead of lost
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    result_expires=settings.CRAWL_JOB_RESULT_TTL,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_store_eager_result=True,
+    # A redelivered job must wait out the longest possible crawl first
+    broker_transport_options={"visibility_timeout": int(settings.CRAWL_TIME_LIMIT) + 3600},
+)
+
+
+@celery_app.task(name="crawl.run", bind=True)
+def run_crawl(self, sources: Optional[List[str]] = None, due_only: bool = False) -> Dict[str, Any]:
+    """
+    Worker side of a crawl job: runs the crawl on a fresh event loop and returns its summary.
+    A crawl still going after JOB_TIME_LIMIT seconds is cancelled and the job fails.
+    """
+    # Imported here so the API process can enqueue without building the crawlers
+    from api.services.crawl_service import crawler_service
+
+    # Picked up: no longer queued, and the run lease covers it from here on
+    try:
+        crawl_queue.release(queue_owner(self.request.id))
+    except Exception as e:
+        print(f"Failed to clear queued crawl job (it will expire on its own): {e}")
+
+    if due_only:
+        crawl = crawler_service.crawl_due(job_id=self.request.id)
+    else:
+        crawl = crawler_service.crawl_all(names=sources, job_id=self.request.id)
+    return asyncio.run(_limited(crawl))
+
+
+async def _limited(crawl) -> Dict[str, Any]:
+    try:
+        return await asyncio.wait_for(crawl, timeout=JOB_TIME_LIMIT)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Crawl job exceeded {JOB_TIME_LIMIT:g}s")
+
+
+def queue_owner(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def enqueue_crawl(sources: Optional[List[str]] = None, due_only: bool = False, job_id: Optional[str] = None) -> str:
+    """
+    Queue a crawl job and return its id (`job_id` if given). Blocks on the broker round trip, so call it off the event loop.
+    """
+    return run_crawl.apply_async(kwargs={"sources": sources, "due_only": due_only}, task_id=job_id).id
+
+
+def job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Current state of a crawl job: PENDING (queued, or unknown id), STARTED, SUCCESS or FAILURE.
+    """
+    result = AsyncResult(job_id, app=celery_app)
+    status = {"job_id": job_id, "status": result.state, "result": None, "error": None}
+    if result.state == "SUCCESS":
+        status["result"] = result.result
+    elif result.state == "FAILURE":
+        status["error"] = str(result.result)
+    if result.date_done:
+        status["finished_at"] = result.date_done.isoformat()
+    return status
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from api.core.config import settings
+from api.core.database import supabase, run_db
+
+
+class LeaseHeld(Exception):
+    """Raised when another run already holds the lease. `lease` is that run's lease row."""
+    def __init__(self, lease: Dict[str, Any]):
+        super().__init__(f"crawl lease held by {lease.get('owner')} (run {lease.get('run_id')})")
+        self.lease = lease
+
+
+class LeaseLost(Exception):
+    """Raised out of hold() when a renewal finds the lease gone; the block was cancelled."""
+    def __init__(self, lease: Dict[str, Any]):
+        super().__init__(f"crawl lease lost by {lease.get('owner')} (run {lease.get('run_id')})")
+        self.lease = lease
+
+
+class CrawlLease:
+    """
+    Single-flight lease over crawl runs, stored in the crawl_leases table.
+
+    Acquisition is one atomic INSERT ... ON CONFLICT that only succeeds if the
+    lease is free or expired, so concurrent triggers can't both win. The holder
+    renews it every ttl/3 seconds; if the holder dies the lease lapses after
+    `ttl` and the next trigger takes over.
+    """
+    def __init__(self, name: str = "crawl", ttl: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl or settings.CRAWL_LEASE_TTL
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def acquire(self, owner: str, run_id: Optional[str], job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        res = supabase.rpc("acquire_crawl_lease", {
+            "p_name": self.name,
+            "p_owner": owner,
+            "p_run_id": run_id,
+            "p_job_id": job_id,
+            "p_ttl_seconds": self.ttl,
+        }).execute()
+        return res.data[0] if res.data else None
+
+    def renew(self, owner: str) -> bool:
+        res = supabase.rpc("renew_crawl_lease", {"p_name": self.name, "p_owner": owner, "p_ttl_seconds": self.ttl}).execute()
+        return bool(res.data)
+
+    def release(self, owner: str):
+        supabase.table("crawl_leases").delete().eq("name", self.name).eq("owner", owner).execute()
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """
+        The live lease row, or None if nobody holds it (or it has expired).
+        """
+        res = supabase.table("crawl_leases").select("*").eq("name", self.name).execute()
+        if not res.data:
+            return None
+        lease = res.data[0]
+        if datetime.fromisoformat(lease["expires_at"]) <= datetime.now(timezone.utc):
+            return None
+        return lease
+
+    async def _heartbeat(self, owner: str, holder: asyncio.Task) -> bool:
+        """
+        Renew every ttl/3 seconds. If the lease turns out to be gone (it lapsed and
+        another run took it), cancel `holder` so two runs don't crawl at once, and return True.
+        """
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                if not await run_db(self.renew, owner):
+                    print(f"Crawl lease {self.name} was lost by {owner}, stopping the run")
+                    holder.cancel(f"crawl lease {self.name} lost")
+                    return True
+            except Exception as e:
+                # Keep trying; the lease only lapses after a full TTL without a renewal
+                print(f"Crawl lease heartbeat failed: {e}")
+
+    @asynccontextmanager
+    async def hold(self, run_id: str, job_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Hold the lease for the duration of the block, heartbeating in the background.
+        Raises LeaseHeld if another run has it, and LeaseLost (after cancelling the
+        block) if it is lost partway through.
+        """
+        owner = f"{self.owner}:{uuid.uuid4().hex[:8]}"
+        guarded = True
+        try:
+            lease = await run_db(self.acquire, owner, run_id, job_id)
+        except Exception as e:
+            # Lease storage unavailable: run unguarded rather than not crawl at all
+            print(f"Could not acquire crawl lease, running without it: {e}")
+            guarded = False
+        if not guarded:
+            yield {"name": self.name, "owner": owner, "run_id": run_id, "job_id": job_id}
+            return
+        if lease is None:
+            current = await run_db(self.current)
+            # It may have been released between the two calls; report what we know
+            raise LeaseHeld(current or {})
+
+        holder = asyncio.current_task()
+        heartbeat = asyncio.create_task(self._heartbeat(owner, holder))
+        try:
+            yield lease
+        except asyncio.CancelledError:
+            if not (heartbeat.done() and not heartbeat.cancelled() and heartbeat.result()):
+                raise
+            # Our own cancellation: surface it as an error, not as the caller being cancelled
+            holder.uncancel()
+            raise LeaseLost(lease) from None
+        finally:
+            heartbeat.cancel()
+            try:
+                await run_db(self.release, owner)
+            except Exception as e:
+                print(f"Failed to release crawl lease (it will expire on its own): {e}")
+
+
+crawl_lease = CrawlLease()
+# Held from queueing a crawl job until a worker picks it up, so repeated triggers
+# return the queued job instead of piling up more. Owned by "job:<job id>", no run id.
+crawl_queue = CrawlLease("crawl-queue", ttl=settings.CRAWL_QUEUE_TTL)
@@ -0,0 +1,125 @@
+import asyncio
+import base64
+import json
+import uuid
+from datetime import date
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
+
+from api.core.database import supabase, execute
+
+# exact: full COUNT(*); estimated: exact for small results, the planner's estimate above that; none: no count
+CountMode = Literal["exact", "estimated", "none"]
+
+
+def encode_cursor(sort: str, row: Dict[str, Any]) -> str:
+    """
+    Opaque cursor pointing just past `row` in (sort DESC, id DESC) order.
+    """
+    raw = json.dumps([sort, row[sort], row["id"]], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _integer(value: Any) -> int:
+    # bool is an int subclass, but never a valid key
+    if type(value) is not int:
+        raise ValueError
+    return value
+
+
+def _iso_date(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError
+    return date.fromisoformat(value).isoformat()
+
+
+def _uuid(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError
+    return str(uuid.UUID(value))
+
+
+# What a cursor may carry: the sort columns' values and each table's id
+SORT_TYPES: Dict[str, Callable[[Any], Any]] = {"stars": _integer, "published_date": _iso_date}
+ID_TYPES: Dict[str, Callable[[Any], Any]] = {"github_projects": _integer, "papers": _uuid}
+
+
+def decode_cursor(cursor: str, table: str, sort: str) -> Tuple[Any, Any]:
+    """
+    (sort value, id) from a cursor made by encode_cursor for the same table and sort column,
+    checked against SORT_TYPES/ID_TYPES. Raises ValueError for anything else.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        column, value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if column != sort:
+        raise ValueError("Cursor belongs to a different listing")
+    try:
+        return SORT_TYPES[sort](value), ID_TYPES[table](last_id)
+    except (TypeError, ValueError):
+        raise ValueError("Malformed cursor")
+
+
+def _literal(value: Any) -> str:
+    # Cursor values are validated to ints and plain strings (dates, UUIDs); anything else must not reach a filter
+    if type(value) is int:
+        return str(value)
+    if isinstance(value, str) and '"' not in value and "\\" not in value:
+        # PostgREST filter values may be double-quoted so commas/parentheses can't break the expression
+        return f'"{value}"'
+    raise ValueError(f"Unsupported cursor value: {value!r}")
+
+
+async def paginate(
+    table: str,
+    sort: str,
+    filters: Dict[str, Any],
+    limit: int,
+    page: int = 1,
+    after: Optional[Tuple[Any, Any]] = None,
+    count: CountMode = "exact",
+) -> Dict[str, Any]:
+    """
+    One page of `table` rows matching the `filters` (column == value), newest/largest `sort` first.
+
+    Without `after` this is offset paging by `page`. With `after` (a decoded
+    cursor) it is keyset paging: rows strictly after that (sort, id) position,
+    which an index on (..., sort DESC, id DESC) serves at the same cost on any
+    page. Either way one extra row is read to tell whether `next_cursor` is needed.
+    """
+    def select(*columns, **kwargs):
+        query = supabase.table(table).select(*columns, **kwargs)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        return query
+
+    # id breaks ties, so the order (and so every cursor) is total
+    if after is None:
+        # Offset mode counts inline, in the same round trip
+        query = select("*", count=None if count == "none" else count)
+        start = (page - 1) * limit
+        query = query.order(sort, desc=True).order("id", desc=True).range(start, start + limit)
+        result = await execute(query)
+        rows, total = result.data, result.count
+    else:
+        value, last_id = after
+        query = select("*").order(sort, desc=True).order("id", desc=True).or_(
+            f"{sort}.lt.{_literal(value)},and({sort}.eq.{_literal(value)},id.lt.{_literal(last_id)})"
+        ).limit(limit + 1)
+        if count == "none":
+            rows, total = (await execute(query)).data, None
+        else:
+            # The keyset filter would shrink the count, so the listing is counted on its own, concurrently
+            result, counted = await asyncio.gather(execute(query), execute(select("id", count=count, head=True)))
+            rows, total = result.data, counted.count
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "data": rows,
+        "total": total,
+        "page": page if after is None else None,
+        "limit": limit,
+        "next_cursor": encode_cursor(sort, rows[-1]) if more and rows else None,
+    }
@@ -0,0 +1,72 @@
+import asyncio
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from api.core.config import settings
+from api.services.telemetry import timed
+
+
+class ParseExecutor:
+    """
+    Runs CPU-bound parse functions off the event loop.
+
+    Payloads above CRAWLER_PARSE_INLINE_BYTES go to a process pool; tiny ones are
+    parsed inline since pickling them costs more than parsing. Parse functions
+    must be module-level and return plain dicts/lists so results pickle cleanly.
+    If a process pool can't be used (e.g. no /dev/shm on serverless), parsing
+    falls back to a worker thread.
+    """
+    def __init__(self, workers: Optional[int] = None, inline_bytes: Optional[int] = None):
+        self.workers = settings.CRAWLER_PARSE_WORKERS if workers is None else workers
+        self.inline_bytes = settings.CRAWLER_PARSE_INLINE_BYTES if inline_bytes is None else inline_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_failed = False
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0 or self._pool_failed:
+            return None
+        if self._pool is None:
+            try:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError) as e:
+                print(f"Process pool unavailable, parsing in threads instead: {e}")
+                self._pool_failed = True
+                return None
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], payload: str, *args) -> Any:
+        # Counted as parse time for the current crawl source, queueing for a worker included
+        with timed("parse_time"):
+            return await self._run(func, payload, *args)
+
+    async def _run(self, func: Callable[..., Any], payload: str, *args) -> Any:
+        if len(payload) < self.inline_bytes:
+            return func(payload, *args)
+
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(func, payload, *args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, func, payload, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, killed); start a fresh pool next time
+            print("Parse worker pool broke, retrying in a thread")
+            self.shutdown()
+            return await asyncio.to_thread(func, payload, *args)
+
+    def shutdown(self):
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+parse_executor = ParseExecutor()
+atexit.register(parse_executor.shutdown)
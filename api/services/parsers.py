@@ -0,0 +1,265 @@
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from xml.etree import ElementTree
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from api.core.config import settings
+
+# Optional fast backends, preferred in this order when available
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+# Every backend yields the same raw fields per trending row; build_project
+# turns them into the project dict, so all backends produce identical output.
+
+def _bs4_rows(html: str, features: str = "html.parser") -> Iterator[Dict[str, Any]]:
+    soup = BeautifulSoup(html, features)
+    for row in soup.select('article.Box-row'):
+        link = row.select_one('h2.h3 a')
+        if not link:
+            continue
+        desc_elem = row.select_one('p.col-9')
+        lang_elem = row.select_one('span[itemprop="programmingLanguage"]')
+        yield {
+            "href": link['href'],
+            "full_name": link.get_text(strip=True),
+            "description": desc_elem.get_text(strip=True) if desc_elem else None,
+            "language": lang_elem.get_text(strip=True) if lang_elem else None,
+            "stats": [a.get_text(strip=True) for a in row.select('a.Link--muted')[:2]],
+        }
+
+
+def _selectolax_rows(html: str) -> Iterator[Dict[str, Any]]:
+    tree = LexborHTMLParser(html)
+
+    def text(node):
+        return node.text(deep=True, separator='', strip=True)
+
+    for row in tree.css('article.Box-row'):
+        link = row.css_first('h2.h3 a')
+        if link is None:
+            continue
+        desc_elem = row.css_first('p.col-9')
+        lang_elem = row.css_first('span[itemprop="programmingLanguage"]')
+        yield {
+            "href": link.attributes['href'],
+            "full_name": text(link),
+            "description": text(desc_elem) if desc_elem is not None else None,
+            "language": text(lang_elem) if lang_elem is not None else None,
+            "stats": [text(a) for a in row.css('a.Link--muted')[:2]],
+        }
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _lxml_rows(html: str) -> Iterator[Dict[str, Any]]:
+    tree = lxml.html.fromstring(html)
+
+    def text(el):
+        return ''.join(part.strip() for part in el.itertext())
+
+    for row in tree.xpath(f"//article[{_has_class('Box-row')}]"):
+        links = row.xpath(f".//h2[{_has_class('h3')}]//a")
+        if not links:
+            continue
+        link = links[0]
+        desc_elem = row.xpath(f".//p[{_has_class('col-9')}]")
+        lang_elem = row.xpath(".//span[@itemprop='programmingLanguage']")
+        yield {
+            "href": link.get('href'),
+            "full_name": text(link),
+            "description": text(desc_elem[0]) if desc_elem else None,
+            "language": text(lang_elem[0]) if lang_elem else None,
+            "stats": [text(a) for a in row.xpath(f".//a[{_has_class('Link--muted')}]")[:2]],
+        }
+
+
+PARSERS: Dict[str, Callable[[str], Iterator[Dict[str, Any]]]] = {"html.parser": _bs4_rows}
+if lxml is not None:
+    PARSERS["lxml"] = _lxml_rows
+if LexborHTMLParser is not None:
+    PARSERS["selectolax"] = _selectolax_rows
+
+
+def available_parsers() -> List[str]:
+    return list(PARSERS)
+
+
+def get_parser_name(name: Optional[str] = None) -> str:
+    """
+    Resolve a backend name. "auto" picks the fastest installed backend.
+    """
+    name = name or settings.GITHUB_HTML_PARSER
+    if name == "auto":
+        for candidate in ("selectolax", "lxml", "html.parser"):
+            if candidate in PARSERS:
+                return candidate
+    if name not in PARSERS:
+        print(f"HTML parser '{name}' not available, falling back to html.parser")
+        return "html.parser"
+    return name
+
+
+def build_project(raw: Dict[str, Any], since: str, today: str) -> Dict[str, Any]:
+    full_name = raw["full_name"].replace(' ', '').replace('\n', '')
+    href = raw["href"]
+    parts = full_name.split('/')
+    stats = raw["stats"]
+    stars_str = stats[0].replace(',', '') if len(stats) > 0 else "0"
+    forks_str = stats[1].replace(',', '') if len(stats) > 1 else "0"
+
+    return {
+        "repo_id": href.strip('/'),  # Simple ID
+        "name": parts[1] if len(parts) > 1 else full_name,
+        "full_name": full_name,
+        "description": raw["description"],
+        "language": raw["language"],
+        "stars": int(stars_str),
+        "forks": int(forks_str),
+        "url": f"https://github.com{href}",
+        "trending_date": today,
+        "since": since,
+    }
+
+
+def parse_github_trending(
+    html: str, since: str = "daily", parser: Optional[str] = None, today: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Parse a GitHub trending page into project dicts using the configured backend.
+    `today` overrides the trending_date, e.g. when re-parsing an archived page.
+    """
+    rows = PARSERS[get_parser_name(parser)]
+    today = today or date.today().isoformat()
+
+    projects = []
+    for raw in rows(html):
+        try:
+            projects.append(build_project(raw, since, today))
+        except Exception as e:
+            print(f"Error parsing row: {e}")
+            continue
+    return projects
+
+
+def arxiv_id(entry_id: str) -> str:
+    """
+    Stable arXiv identifier from an entry id URL, without the version suffix:
+    http://arxiv.org/abs/2410.12000v2 -> 2410.12000, .../abs/cs/0112017v1 -> cs/0112017
+    """
+    ident = entry_id.split("/abs/", 1)[-1].strip()
+    return re.sub(r"v\d+$", "", ident)
+
+
+def parse_arxiv_feed(xml: str, with_timestamps: bool = False) -> List[Any]:
+    """
+    Parse an arXiv Atom response into paper dicts (without category_id).
+    With `with_timestamps=True` returns (paper, submitted_at ISO string) pairs instead.
+    """
+    feed = feedparser.parse(xml)
+
+    papers = []
+    for entry in feed.entries:
+        try:
+            # Extract authors
+            authors = [author.name for author in entry.authors]
+
+            # Extract PDF link
+            pdf_url = None
+            for link in entry.links:
+                if link.type == 'application/pdf':
+                    pdf_url = link.href
+
+            submitted_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+            paper = {
+                "title": entry.title.replace('\n', ' '),
+                "abstract": entry.summary.replace('\n', ' '),
+                "authors": authors,
+                "pdf_url": pdf_url,
+                "published_date": submitted_at.date().isoformat(),
+                "source": "arxiv",
+                "external_id": arxiv_id(entry.id),
+            }
+            papers.append((paper, submitted_at.isoformat()) if with_timestamps else paper)
+        except Exception as e:
+            print(f"Error parsing paper: {e}")
+            continue
+    return papers
+
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class ArxivStreamParser:
+    """
+    Incremental Atom parser for arXiv responses.
+
+    Feed it raw byte chunks as they arrive; it returns the (paper, submitted_at)
+    pairs completed so far and drops each entry once emitted, so memory stays
+    bounded by the largest single entry rather than the whole page.
+    Produces the same paper dicts as parse_arxiv_feed.
+    """
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[Any]:
+        papers = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            if elem.tag != f"{ATOM}entry":
+                continue
+            try:
+                papers.append(self._paper(elem))
+            except Exception as e:
+                print(f"Error parsing paper: {e}")
+            if self._root is not None:
+                self._root.remove(elem)
+        return papers
+
+    @staticmethod
+    def _paper(entry) -> Any:
+        def text(tag):
+            return (entry.findtext(f"{ATOM}{tag}") or "").strip()
+
+        pdf_url = None
+        for link in entry.findall(f"{ATOM}link"):
+            if link.get("type") == 'application/pdf':
+                pdf_url = link.get("href")
+
+        published = text("published").replace("Z", "+00:00")
+        submitted_at = datetime.fromisoformat(published).astimezone(timezone.utc)
+        paper = {
+            "title": text("title").replace('\n', ' '),
+            "abstract": text("summary").replace('\n', ' '),
+            "authors": [a.findtext(f"{ATOM}name", "").strip() for a in entry.findall(f"{ATOM}author")],
+            "pdf_url": pdf_url,
+            "published_date": submitted_at.date().isoformat(),
+            "source": "arxiv",
+            "external_id": arxiv_id(text("id")),
+        }
+        return paper, submitted_at.isoformat()
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from api.core.config import settings
+
+# End-of-stream marker; each worker of the next stage consumes exactly one
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step run by `concurrency` workers.
+
+    `func` takes one item and returns an item, a list of items (each passed on
+    separately) or None (dropped). With `batch_size` set, `func` instead gets
+    lists of up to that many items, which is how the write stage batches rows.
+    """
+    name: str
+    func: Callable[[Any], Awaitable[Any]]
+    concurrency: int = 1
+    batch_size: Optional[int] = None
+
+
+@dataclass
+class StageStats:
+    received: int = 0
+    emitted: int = 0
+    errors: int = 0
+
+
+@dataclass
+class PipelineResult:
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    first_output: Optional[float] = None  # seconds until the last stage first finished an item
+    elapsed: float = 0.0
+
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+
+    Stages work concurrently, so while later items are still being fetched the
+    first ones are already parsed and written; a full queue makes its upstream
+    stage wait, so memory stays bounded by the queue sizes. An item that fails
+    in a stage is logged and dropped without stopping the others.
+    """
+    def __init__(self, stages: List[Stage], name: str = "pipeline", queue_size: Optional[int] = None, linger: Optional[float] = None):
+        self.stages = stages
+        self.name = name
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        # How long a batching stage waits to fill a batch before handing over a partial one
+        self.linger = settings.PIPELINE_WRITE_LINGER if linger is None else linger
+
+    async def _produce(self, source: Union[AsyncIterable[Any], Iterable[Any]], queue: asyncio.Queue, consumers: int):
+        if hasattr(source, "__aiter__"):
+            async for item in source:
+                await queue.put(item)
+        else:
+            for item in source:
+                await queue.put(item)
+        for _ in range(consumers):
+            await queue.put(_DONE)
+
+    async def _apply(self, stage: Stage, item: Any, stats: StageStats, output: Optional[asyncio.Queue], result: PipelineResult, started: float):
+        stats.received += len(item) if stage.batch_size else 1
+        try:
+            out = await stage.func(item)
+        except Exception as e:
+            stats.errors += 1
+            print(f"{self.name} {stage.name} failed: {e}")
+            return
+        if output is None and result.first_output is None:
+            result.first_output = time.monotonic() - started
+        if out is None:
+            return
+        for value in out if isinstance(out, list) else [out]:
+            stats.emitted += 1
+            if output is not None:
+                await output.put(value)
+
+    async def _worker(self, stage: Stage, queue: asyncio.Queue, output: Optional[asyncio.Queue], stats: StageStats, result: PipelineResult, started: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if not stage.batch_size:
+                await self._apply(stage, item, stats, output, result, started)
+                continue
+
+            batch, finished = [item], False
+            deadline = loop.time() + self.linger
+            while len(batch) < stage.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                batch.append(item)
+            await self._apply(stage, batch, stats, output, result, started)
+            if finished:
+                return
+
+    async def _run_stage(self, index: int, queues: List[asyncio.Queue], result: PipelineResult, started: float):
+        stage = self.stages[index]
+        output = queues[index + 1] if index + 1 < len(self.stages) else None
+        stats = result.stages[stage.name]
+        await asyncio.gather(*(
+            self._worker(stage, queues[index], output, stats, result, started)
+            for _ in range(stage.concurrency)
+        ))
+        if output is not None:
+            for _ in range(self.stages[index + 1].concurrency):
+                await output.put(_DONE)
+
+    async def run(self, source: Union[AsyncIterable[Any], Iterable[Any]]) -> PipelineResult:
+        """
+        Feed `source` through every stage and wait until the last item is done.
+        Errors from `source` itself stop the pipeline and propagate.
+        """
+        started = time.monotonic()
+        result = PipelineResult(stages={stage.name: StageStats() for stage in self.stages})
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        tasks = [asyncio.create_task(self._produce(source, queues[0], self.stages[0].concurrency))]
+        tasks += [asyncio.create_task(self._run_stage(i, queues, result, started)) for i in range(len(self.stages))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        result.elapsed = time.monotonic() - started
+        return result
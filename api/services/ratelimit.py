@@ -0,0 +1,75 @@
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from api.core.config import settings
+
+# Status codes worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host. Hosts without an override use the default rate.
+    """
+    def __init__(
+        self,
+        default_rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        overrides: Optional[Dict[str, float]] = None,
+    ):
+        self.default_rate = default_rate or settings.CRAWLER_HOST_RATE
+        self.burst = burst or settings.CRAWLER_HOST_BURST
+        self.overrides = settings.CRAWLER_HOST_RATES if overrides is None else overrides
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            rate = self.overrides.get(host, self.default_rate)
+            self._buckets[host] = TokenBucket(rate, capacity=min(self.burst, max(rate, 1.0)))
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        await self.bucket(urlsplit(url).netloc).acquire()
+
+
+def backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Full-jitter exponential backoff. A numeric Retry-After header wins when present.
+    """
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), settings.CRAWLER_BACKOFF_MAX)
+    ceiling = min(settings.CRAWLER_BACKOFF_MAX, settings.CRAWLER_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
@@ -0,0 +1,37 @@
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
+
+from api.services.archive import ResponseArchive
+from api.services.parsers import parse_github_trending, parse_arxiv_feed
+
+HN_ITEM_PATH = re.compile(r"/item/(\d+)\.json$")
+
+
+def parse_archived(root: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Re-run the current parser over one archived response (a process pool worker).
+
+    Returns {"entry", "kind", "rows"} plus "category" for arXiv pages. Rows are
+    not yet tied to categories: that needs the database, so the caller does it.
+    Responses no parser applies to (HN id lists, for instance) come back with kind None.
+    """
+    body = ResponseArchive(root).read(entry["sha256"])
+    parts = urlsplit(entry["url"])
+    query = parse_qs(parts.query)
+    result = {"entry": entry, "kind": None, "rows": []}
+
+    if entry["source"] == "github":
+        since = query.get("since", ["daily"])[0]
+        # The page lists what was trending on the day it was fetched
+        today = datetime.fromisoformat(entry["fetched_at"]).date().isoformat()
+        result.update(kind="projects", rows=parse_github_trending(body.decode("utf-8", "replace"), since, today=today))
+    elif entry["source"] == "arxiv":
+        category = query.get("search_query", [""])[0].removeprefix("cat:")
+        result.update(kind="arxiv", category=category, rows=parse_arxiv_feed(body.decode("utf-8", "replace")))
+    elif entry["source"] == "hackernews" and HN_ITEM_PATH.search(parts.path):
+        item = json.loads(body)
+        result.update(kind="hn_item", rows=[item] if item else [])
+    return result
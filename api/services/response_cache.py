@@ -0,0 +1,294 @@
+import asyncio
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from api.core.config import settings
+from api.core.database import run_db
+from api.services.crawl_runs import latest_finished_run
+
+
+class RedisTier:
+    """
+    Optional cache tier shared by every API instance through Redis, so a cold
+    serverless instance starts warm. Enabled by RESPONSE_CACHE_REDIS_URL.
+
+    Keys live under a namespace number that each crawl increments; entries of
+    older namespaces are never read again and expire with their TTL. Payloads
+    are compact JSON, zlib-compressed when large.
+
+    Any Redis error fails open: the caller falls back to the database and the
+    tier is skipped for RESPONSE_CACHE_REDIS_RETRY seconds.
+    """
+    PREFIX = "techvision:responses"
+    COMPRESS_BYTES = 1024
+
+    def __init__(self, url: Optional[str] = None, ttl: Optional[float] = None, client: Any = None):
+        self.url = settings.RESPONSE_CACHE_REDIS_URL if url is None else url
+        self.ttl = settings.RESPONSE_CACHE_REDIS_TTL if ttl is None else ttl
+        self._client = client
+        self._down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._client is not None or self.url)
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+            from redis.backoff import NoBackoff
+            from redis.retry import Retry
+            timeout = settings.RESPONSE_CACHE_REDIS_TIMEOUT
+            # No client-side retries: on any error the database answers instead
+            self._client = redis.Redis.from_url(
+                self.url, socket_timeout=timeout, socket_connect_timeout=timeout, retry=Retry(NoBackoff(), 0),
+            )
+        return self._client
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        raw = json.dumps(value, separators=(",", ":"), default=str).encode()
+        if len(raw) >= RedisTier.COMPRESS_BYTES:
+            return b"z" + zlib.compress(raw)
+        return b"j" + raw
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        body = payload[1:]
+        return json.loads(zlib.decompress(body) if payload[:1] == b"z" else body)
+
+    def _key(self, namespace: int, key: Tuple) -> str:
+        return f"{self.PREFIX}:{namespace}:{json.dumps(key, separators=(',', ':'), default=str)}"
+
+    def _sync_call(self, func: Callable[[], Any]) -> Any:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return func()
+        except Exception as e:
+            self.errors += 1
+            self._down_until = time.monotonic() + settings.RESPONSE_CACHE_REDIS_RETRY
+            print(f"Redis response cache unavailable, using the database: {e}")
+            return None
+
+    async def _call(self, func: Callable[[], Any]) -> Any:
+        # redis-py's sync client, as for the job queue; it is not tied to one event loop
+        return await asyncio.to_thread(self._sync_call, func)
+
+    def namespace(self) -> Optional[int]:
+        """
+        Current namespace (blocking). None while Redis is down.
+        """
+        return self._sync_call(lambda: int(self.client.get(f"{self.PREFIX}:namespace") or 0))
+
+    async def get(self, namespace: int, key: Tuple) -> Optional[Any]:
+        payload = await self._call(lambda: self.client.get(self._key(namespace, key)))
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.decode(payload)
+
+    async def put(self, namespace: int, key: Tuple, value: Any):
+        payload = self.encode(value)
+        await self._call(lambda: self.client.set(self._key(namespace, key), payload, ex=max(1, int(self.ttl))))
+
+    async def bump(self) -> Optional[int]:
+        return await self._call(lambda: self.client.incr(f"{self.PREFIX}:namespace"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache with TTL for API responses whose data only changes when a crawl runs.
+
+    Entries are keyed on an endpoint name plus its normalized query params and
+    bounded both by count and by approximate size (their JSON length). A crawl
+    finishing bumps the data generation, which drops every entry: in this
+    process directly, and in other processes (API workers, while crawls run
+    on the job worker) when they next see a newer finished crawl run, checked
+    at most every RESPONSE_CACHE_GENERATION_POLL seconds. The TTL bounds
+    staleness if that check fails.
+
+    With a shared tier (RedisTier) configured, local misses are looked up
+    there before the database, and the tier's namespace replaces the
+    crawl_runs check as the generation signal.
+
+    Concurrent misses on the same key share one load. Entries are guarded by a
+    lock: an eager crawl job invalidates from its own thread and event loop.
+    """
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        generation_poll: Optional[float] = None,
+        generation_source: Optional[Callable[[], Any]] = latest_finished_run,
+        shared: Optional[RedisTier] = None,
+    ):
+        self.ttl = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.RESPONSE_CACHE_MAX_BYTES
+        self.generation_poll = settings.RESPONSE_CACHE_GENERATION_POLL if generation_poll is None else generation_poll
+        self.shared = shared if shared is not None and shared.enabled else None
+        # The shared namespace moves exactly when a crawl finishes, and reading it is cheaper than a DB query
+        self.generation_source = self.shared.namespace if self.shared else generation_source
+
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()  # key -> (expires, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[Tuple, asyncio.Future] = {}
+        self._marker: Any = None
+        self._polled_at: Optional[float] = None
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any]) -> Tuple:
+        # Empty strings and None mean the same thing to the endpoints
+        return (endpoint,) + tuple(sorted((k, v) for k, v in params.items() if v not in (None, "")))
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, size, value = entry
+            if time.monotonic() >= expires:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple, value: Any, generation: Optional[int] = None):
+        """
+        Cache `value`, unless `generation` is given and a bump has happened since.
+        """
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: Tuple):
+        # Caller holds the lock
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def bump(self):
+        """
+        Start a new data generation: everything cached so far is stale. Safe from any thread.
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    async def invalidate(self):
+        """
+        Bump the generation here and, with a shared tier, for every other instance too.
+        """
+        self.bump()
+        if self.shared:
+            namespace = await self.shared.bump()
+            if namespace is not None:
+                self._marker = namespace
+
+    async def _check_generation(self):
+        if self.generation_source is None:
+            return
+        now = time.monotonic()
+        if self._polled_at is not None and now - self._polled_at < self.generation_poll:
+            return
+        # Claimed before awaiting, so concurrent requests don't all poll
+        self._polled_at = now
+        try:
+            marker = await run_db(self.generation_source)
+        except Exception as e:
+            print(f"Response cache generation check failed: {e}")
+            return
+        if self._marker is not None and marker != self._marker:
+            print("Newer crawl finished, dropping cached responses")
+            self.bump()
+        if marker is not None:
+            self._marker = marker
+
+    async def get_or_load(self, endpoint: str, params: Dict[str, Any], load: Callable[[], Awaitable[Any]]) -> Any:
+        await self._check_generation()
+        key = self.key(endpoint, params)
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        generation = self.generation
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = None
+            # The shared tier is only trusted once we know which namespace is current
+            namespace = self._marker if self.shared else None
+            if namespace is not None:
+                value = await self.shared.get(namespace, key)
+            if value is None:
+                value = await load()
+                if namespace is not None:
+                    await self.shared.put(namespace, key, value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unshared failure isn't logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # A load that straddled a bump may hold old data: serve it, don't keep it
+            self.put(key, value, generation)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            generation, entries, size = self.generation, len(self._entries), self._bytes
+        return {
+            "generation": generation,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "shared": self.shared.stats() if self.shared else None,
+        }
+
+
+response_cache = ResponseCache(shared=RedisTier())
@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.core.config import settings
+from api.core.database import supabase
+from api.services.crawl_executor import SourceResult
+
+
+class CrawlScheduler:
+    """
+    Decides which crawl sources are due, adapting each one's interval to how
+    often it actually changes.
+
+    Every run updates the source's change rate, a moving average of whether the
+    run found new or changed rows. The interval is interpolated (geometrically)
+    between the source's bounds: a source that changes on every run is crawled
+    at its minimum interval, one that never changes at its maximum. The next run
+    is jittered so sources don't fire in lockstep. State lives in crawl_schedule.
+    """
+    def __init__(self, jitter: Optional[float] = None, alpha: Optional[float] = None):
+        self.jitter = settings.CRAWL_SCHEDULE_JITTER if jitter is None else jitter
+        self.alpha = settings.CRAWL_CHANGE_RATE_ALPHA if alpha is None else alpha
+
+    def bounds(self, source: str) -> Tuple[float, float]:
+        limits = settings.CRAWL_INTERVAL_BOUNDS.get(source, {})
+        return (
+            float(limits.get("min", settings.CRAWL_INTERVAL_MIN)),
+            float(limits.get("max", settings.CRAWL_INTERVAL_MAX)),
+        )
+
+    def interval_for(self, source: str, change_rate: float) -> float:
+        low, high = self.bounds(source)
+        return high * (low / high) ** min(max(change_rate, 0.0), 1.0)
+
+    def _jittered(self, seconds: float) -> timedelta:
+        return timedelta(seconds=seconds * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        res = supabase.table("crawl_schedule").select("*").execute()
+        return {row["source"]: row for row in res.data}
+
+    def due(self, sources: List[str], now: Optional[datetime] = None) -> List[str]:
+        """
+        Sources whose next run time has passed. Sources never run before are always due.
+        """
+        now = now or datetime.now(timezone.utc)
+        try:
+            schedule = self.load()
+        except Exception as e:
+            # Better to over-crawl than to stop crawling
+            print(f"Could not load crawl schedule, running every source: {e}")
+            return list(sources)
+
+        due = []
+        for source in sources:
+            next_run = (schedule.get(source) or {}).get("next_run_at")
+            if next_run is None or datetime.fromisoformat(next_run) <= now:
+                due.append(source)
+        return due
+
+    def next_state(self, result: SourceResult, previous: Optional[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        previous = previous or {}
+        # A new source starts out assumed busy and backs off from there
+        rate = float(previous.get("change_rate", 1.0))
+        state = {
+            "source": result.name,
+            "last_run_at": now.isoformat(),
+            "last_status": result.status,
+            "last_changed_at": previous.get("last_changed_at"),
+        }
+
+        if result.status in ("ok", "unchanged"):
+            changed = result.stats["new"] + result.stats["changed"] > 0
+            rate = (1 - self.alpha) * rate + self.alpha * (1.0 if changed else 0.0)
+            interval = self.interval_for(result.name, rate)
+            if changed:
+                state["last_changed_at"] = now.isoformat()
+            next_run = now + self._jittered(interval)
+        else:
+            # A failed or cut-short run says nothing about the change rate; try again soon
+            interval = self.interval_for(result.name, rate)
+            next_run = now + self._jittered(self.bounds(result.name)[0])
+
+        state.update({
+            "change_rate": round(rate, 4),
+            "interval_seconds": int(interval),
+            "next_run_at": next_run.isoformat(),
+            "updated_at": now.isoformat(),
+        })
+        return state
+
+    def record(self, results: List[SourceResult], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Fold a run's results into the schedule and store it.
+        """
+        now = now or datetime.now(timezone.utc)
+        try:
+            schedule = self.load()
+        except Exception as e:
+            print(f"Could not load crawl schedule: {e}")
+            schedule = {}
+
+        rows = [self.next_state(result, schedule.get(result.name), now) for result in results]
+        if rows:
+            supabase.table("crawl_schedule").upsert(rows, on_conflict="source").execute()
+        return rows
+
+
+crawl_scheduler = CrawlScheduler()
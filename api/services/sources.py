@@ -0,0 +1,369 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from api.core.config import settings
+from api.core.database import run_db
+from api.services.change_detection import project_changes, paper_changes
+from api.services.crawlers import BaseCrawler, GithubCrawler, ArxivCrawler, HackerNewsCrawler
+from api.services.http_cache import NotModified
+from api.services.parse_executor import parse_executor
+from api.services.parsers import parse_github_trending
+from api.services.pipeline import Pipeline, PipelineResult, Stage
+from api.services.telemetry import current_metrics, timed
+from api.services.writer import batch_writer, WriteOutcome
+
+
+def _report_failures(label: str, outcomes: List[WriteOutcome]):
+    failed = [o for o in outcomes if not o.ok]
+    for o in failed[:5]:
+        print(f"Failed to save {label} {o.row.get('name') or o.row.get('title')}: {o.error}")
+    if len(failed) > 5:
+        print(f"... and {len(failed) - 5} more failed {label} rows")
+
+
+async def save_projects(projects: List[Dict[str, Any]], stats: Optional[Dict[str, int]] = None) -> List[WriteOutcome]:
+    with timed("write_time"):
+        # Only rows whose content hash differs from the stored one are written
+        projects = await project_changes.filter(projects, stats)
+        outcomes = await batch_writer.write("github_projects", projects, on_conflict="repo_id,since")
+    _report_failures("project", outcomes)
+    return outcomes
+
+
+async def save_papers(papers: List[Dict[str, Any]], stats: Optional[Dict[str, int]] = None) -> List[WriteOutcome]:
+    with timed("write_time"):
+        papers = await paper_changes.filter(papers, stats)
+        # Keyed on the source's own id, so re-crawled papers update in place
+        outcomes = await batch_writer.write("papers", papers, on_conflict="source,external_id")
+    _report_failures("paper", outcomes)
+    return outcomes
+
+
+class _Unit:
+    """
+    One fetched unit on its way through the pipeline: how many of its rows are
+    still to be written, and whether any stage failed on one of them.
+    """
+    __slots__ = ("raw", "pending", "failed")
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.pending = 0
+        self.failed = False
+
+
+class CrawlSource:
+    """
+    One crawlable upstream, as seen by the crawl executor.
+
+    A source is run as a streaming pipeline (see Pipeline), one unit of work at a time:
+      requests  - yields the units to fetch (URLs, ids, ...)
+      fetch     - downloads one unit, returns raw or lightly extracted data
+      parse     - turns that into row dicts (default: pass-through)
+      normalize - cleans or drops one row (default: pass-through)
+      write     - persists a batch of rows, counting new/changed/skipped into `stats`
+    so the first rows are written while later units are still downloading.
+    Once every row of a unit is written, commit() is called with its raw data,
+    e.g. to store HTTP validators only for responses that made it into the
+    database. Units that fail somewhere, or parse to no rows, are not committed.
+    `concurrency` caps fetch workers (the source's in-flight upstream requests),
+    `parse_concurrency`/`write_concurrency` the other stages, `write_batch` the
+    rows per write and `timeout` the whole source run. CRAWL_SOURCE_LIMITS
+    overrides any of them.
+
+    Sources that must order writes relative to fetching (e.g. to checkpoint)
+    can override run() instead.
+    """
+    name: str = ""
+    concurrency: int = 4
+    parse_concurrency: int = settings.PIPELINE_PARSE_CONCURRENCY
+    write_concurrency: int = settings.PIPELINE_WRITE_CONCURRENCY
+    write_batch: int = settings.PIPELINE_WRITE_BATCH
+    timeout: float = 60.0
+
+    def __init__(self):
+        limits = settings.CRAWL_SOURCE_LIMITS.get(self.name, {})
+        self.concurrency = int(limits.get("concurrency", self.concurrency))
+        self.parse_concurrency = int(limits.get("parse_concurrency", self.parse_concurrency))
+        self.write_concurrency = int(limits.get("write_concurrency", self.write_concurrency))
+        self.write_batch = int(limits.get("write_batch", self.write_batch))
+        self.timeout = float(limits.get("timeout", self.timeout))
+
+    @property
+    def crawler(self) -> BaseCrawler:
+        raise NotImplementedError
+
+    def requests(self) -> AsyncIterator[Any]:
+        raise NotImplementedError
+
+    async def fetch(self, unit: Any) -> Any:
+        raise NotImplementedError
+
+    async def parse(self, raw: Any) -> Any:
+        return raw
+
+    async def normalize(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return row
+
+    async def write(self, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> Optional[List[WriteOutcome]]:
+        """
+        Persist rows. Returning the write outcomes lets rows that failed hold back their unit's commit.
+        """
+        raise NotImplementedError
+
+    async def commit(self, raw: Any):
+        pass
+
+    async def finish(self, result: PipelineResult):
+        """
+        Called once the pipeline has drained. Raises if the run should not count as ok.
+        """
+        failed = result.stages["write"].errors
+        if failed:
+            raise RuntimeError(f"{failed} of {self.name}'s write batches failed")
+
+    async def _row_done(self, unit: _Unit):
+        unit.pending -= 1
+        if unit.pending == 0 and not unit.failed:
+            await self.commit(unit.raw)
+
+    async def run(self, stats: Dict[str, int]) -> int:
+        written = 0
+
+        # Items travel as (unit, payload) so each row can be traced back to the response it came from
+        async def fetch(request):
+            raw = await self.fetch(request)
+            return None if raw is None else (_Unit(raw), raw)
+
+        async def parse(item):
+            unit, raw = item
+            try:
+                rows = await self.parse(raw)
+            except Exception:
+                unit.failed = True
+                raise
+            rows = [] if rows is None else rows if isinstance(rows, list) else [rows]
+            unit.pending = len(rows)
+            return [(unit, row) for row in rows]
+
+        async def normalize(item):
+            unit, row = item
+            try:
+                row = await self.normalize(row)
+            except Exception:
+                unit.failed = True
+                raise
+            if row is None:
+                await self._row_done(unit)
+                return None
+            return unit, row
+
+        async def write(batch):
+            nonlocal written
+            units = {id(row): unit for unit, row in batch}
+            try:
+                outcomes = await self.write([row for _, row in batch], stats)
+            except Exception:
+                for unit, _ in batch:
+                    unit.failed = True
+                raise
+            for outcome in outcomes or []:
+                if not outcome.ok:
+                    unit = units.get(id(outcome.row))
+                    # A row we can't trace back (copied on the way) holds back the whole batch
+                    for failed in [unit] if unit else [u for u, _ in batch]:
+                        failed.failed = True
+            written += len(batch)
+            for unit, _ in batch:
+                await self._row_done(unit)
+
+        pipeline = Pipeline([
+            Stage("fetch", fetch, self.concurrency),
+            Stage("parse", parse, self.parse_concurrency),
+            Stage("normalize", normalize),
+            Stage("write", write, self.write_concurrency, batch_size=self.write_batch),
+        ], name=self.name)
+        result = await pipeline.run(self.requests())
+
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.first_write = result.first_output
+        await self.finish(result)
+        return written
+
+
+# name -> source class; CrawlerService instantiates every registered source
+SOURCE_TYPES: Dict[str, Type[CrawlSource]] = {}
+
+
+def register_source(cls: Type[CrawlSource]) -> Type[CrawlSource]:
+    SOURCE_TYPES[cls.name] = cls
+    return cls
+
+
+@register_source
+class GithubSource(CrawlSource):
+    name = "github"
+    concurrency = settings.GITHUB_CRAWL_CONCURRENCY
+    timeout = settings.GITHUB_CRAWL_TIME_LIMIT + 5
+
+    def __init__(self):
+        super().__init__()
+        self._crawler = GithubCrawler()
+        self._pages = 0
+        self._not_modified = 0
+        self._late = 0
+        self._deadline = 0.0
+        self._seen = set()
+
+    @property
+    def crawler(self) -> GithubCrawler:
+        return self._crawler
+
+    async def requests(self):
+        self._pages, self._not_modified, self._late, self._seen = 0, 0, 0, set()
+        # Pages still unfetched at the deadline are dropped; what finished by then is written.
+        # `timeout` leaves a few seconds past it for that.
+        self._deadline = time.monotonic() + settings.GITHUB_CRAWL_TIME_LIMIT
+        # trending_cells() caps the matrix at GITHUB_CRAWL_MAX_REQUESTS pages
+        for cell in self._crawler.trending_cells():
+            self._pages += 1
+            yield cell
+
+    async def fetch(self, cell):
+        lang, since = cell
+        url = self._crawler.trending_url(lang, since)
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            self._late += 1
+            return None
+        print(f"Crawling GitHub Trending: {url}")
+        try:
+            response, _ = await asyncio.wait_for(self._crawler.fetch_with_retry(url, conditional=True), remaining)
+        except NotModified:
+            self._not_modified += 1
+            return None
+        except asyncio.TimeoutError:
+            self._late += 1
+            return None
+        return url, response.text, since
+
+    async def parse(self, page):
+        _, html, since = page
+        # Parsed in the process pool while other pages are still downloading
+        return await parse_executor.run(parse_github_trending, html, since)
+
+    async def normalize(self, project):
+        # The same repo shows up on the all-languages page and its own language page
+        key = (project["repo_id"], project["since"])
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        return project
+
+    async def write(self, rows, stats):
+        return await save_projects(rows, stats)
+
+    async def commit(self, page):
+        # Every project on the page is stored, so a 304 for it next time is safe
+        await self._crawler.commit_validators(page[0])
+
+    async def finish(self, result):
+        if self._late:
+            print(f"GitHub matrix hit its {settings.GITHUB_CRAWL_TIME_LIMIT:g}s limit, {self._late} pages dropped")
+        await super().finish(result)
+        if self._pages and self._not_modified == self._pages:
+            raise NotModified("github trending matrix")
+
+
+@register_source
+class ArxivSource(CrawlSource):
+    name = "arxiv"
+    concurrency = 1  # arXiv wants sequential requests anyway
+    timeout = 50.0
+
+    def __init__(self):
+        super().__init__()
+        self._crawler = ArxivCrawler()
+
+    @property
+    def crawler(self) -> ArxivCrawler:
+        return self._crawler
+
+    async def write(self, rows, stats):
+        return await save_papers(rows, stats)
+
+    async def run(self, stats):
+        # Pages are fetched in order and each one is written before its checkpoint
+        # is saved, so this stays sequential rather than a pipeline
+        async def sink(papers):
+            await self.write(papers, stats)
+        return await self._crawler.ingest(sink=sink)
+
+
+@register_source
+class HackerNewsSource(CrawlSource):
+    """
+    Top stories, then a score/comment refresh for recent stored stories that dropped off the list.
+    """
+    name = "hackernews"
+    concurrency = settings.CRAWLER_FANOUT_CONCURRENCY
+    timeout = 40.0
+
+    def __init__(self):
+        super().__init__()
+        self._crawler = HackerNewsCrawler()
+        self._changed = set()
+        self._category_id = None
+        self._legacy = False
+        self._items = 0
+
+    @property
+    def crawler(self) -> HackerNewsCrawler:
+        return self._crawler
+
+    async def requests(self):
+        self._changed = await self._crawler._changed_ids()
+        self._category_id = await run_db(self._crawler._category_id)
+        try:
+            self._legacy = await self._crawler.has_legacy_rows()
+        except Exception as e:
+            print(f"Error checking for URL-keyed HN rows: {e}")
+            self._legacy = False
+
+        self._items = 0
+        top = await self._crawler.top_story_ids()
+        for sid in top:
+            self._items += 1
+            yield sid, False
+        try:
+            recent = await self._crawler.recent_story_ids(exclude={str(sid) for sid in top})
+        except Exception as e:
+            print(f"Error loading recent HN stories: {e}")
+            return
+        for sid in recent:
+            self._items += 1
+            yield sid, True
+
+    async def fetch(self, unit):
+        sid, recent = unit
+        return await self._crawler.get_item(sid, self._changed), recent
+
+    async def parse(self, fetched):
+        item, recent = fetched
+        if recent and not self._crawler.is_recent(item):
+            return None
+        return self._crawler._to_paper(item, self._category_id)
+
+    async def write(self, rows, stats):
+        if self._legacy:
+            await self._crawler.adopt_legacy_rows(rows)
+        return await save_papers(rows, stats)
+
+    async def finish(self, result):
+        self._crawler.report(self._items)
+        self._crawler.cache.save()
+        await super().finish(result)
+        # The story list is only skipped next time once the stories it named are stored
+        await self._crawler.commit_validators(self._crawler.TOP_STORIES_URL)
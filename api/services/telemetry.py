@@ -0,0 +1,96 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    q-th percentile (0-100) with linear interpolation; None for no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class SourceMetrics:
+    """
+    Counters for one source during one crawl run.
+
+    The crawl executor makes an instance current for each source's task, and
+    the HTTP session, retry loops, parse executor and writers add to whichever
+    one is current. Outside a crawl run nothing is recorded.
+    """
+    requests: int = 0
+    bytes_downloaded: int = 0
+    retries: int = 0
+    latencies: List[float] = field(default_factory=list)  # seconds, one per request
+    parse_time: float = 0.0
+    write_time: float = 0.0
+    first_write: Optional[float] = None  # seconds from the source's start until its first rows were written
+
+    def summary(self, rows: int, elapsed: float) -> Dict[str, Any]:
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {
+            "requests": self.requests,
+            "bytes_downloaded": self.bytes_downloaded,
+            "retries": self.retries,
+            "latency_p50_ms": ms(percentile(self.latencies, 50)),
+            "latency_p95_ms": ms(percentile(self.latencies, 95)),
+            "latency_p99_ms": ms(percentile(self.latencies, 99)),
+            "latency_max_ms": ms(max(self.latencies, default=None)),
+            "parse_ms": ms(self.parse_time),
+            "write_ms": ms(self.write_time),
+            "first_write_ms": ms(self.first_write),
+            "rows_per_sec": round(rows / elapsed, 2) if elapsed > 0 else None,
+        }
+
+
+_current: ContextVar[Optional[SourceMetrics]] = ContextVar("crawl_source_metrics", default=None)
+
+
+def current_metrics() -> Optional[SourceMetrics]:
+    return _current.get()
+
+
+def bind_metrics(metrics: Optional[SourceMetrics]):
+    """
+    Make `metrics` current for this task (and the tasks and threads it starts).
+    """
+    return _current.set(metrics)
+
+
+def record_request(latency: float, nbytes: int):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.requests += 1
+        metrics.bytes_downloaded += nbytes
+        metrics.latencies.append(latency)
+
+
+def record_retry():
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.retries += 1
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Add the block's wall time to the current metrics' `stage` ("parse_time" or "write_time").
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            setattr(metrics, stage, getattr(metrics, stage) + time.perf_counter() - started)
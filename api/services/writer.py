@@ -0,0 +1,84 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from postgrest import ReturnMethod
+
+from api.core.config import settings
+from api.core.database import supabase, run_db
+
+
+@dataclass
+class WriteOutcome:
+    """Result of writing one row. Failed rows keep their error for reporting."""
+    row: Dict[str, Any]
+    ok: bool
+    error: Optional[str] = None
+
+
+class BatchWriter:
+    """
+    Writes rows to Supabase as chunked multi-row inserts/upserts.
+
+    Each chunk is one PostgREST round trip; up to `parallelism` chunks are in
+    flight at once. When a chunk is rejected, its rows are retried one by one so
+    a single bad row only costs itself, and every row gets its own outcome.
+    """
+    def __init__(self, batch_size: Optional[int] = None, parallelism: Optional[int] = None):
+        self.batch_size = batch_size or settings.DB_WRITE_BATCH_SIZE
+        self.parallelism = parallelism or settings.DB_WRITE_PARALLELISM
+
+    def _execute(self, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str]):
+        query = supabase.table(table)
+        if on_conflict:
+            query = query.upsert(rows, on_conflict=on_conflict, returning=ReturnMethod.minimal)
+        else:
+            query = query.insert(rows, returning=ReturnMethod.minimal)
+        query.execute()
+
+    def _write_chunk(self, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str]) -> List[WriteOutcome]:
+        try:
+            self._execute(table, rows, on_conflict)
+            return [WriteOutcome(row=row, ok=True) for row in rows]
+        except Exception as e:
+            if len(rows) == 1:
+                return [WriteOutcome(row=rows[0], ok=False, error=str(e))]
+
+        # Isolate the failing rows
+        outcomes = []
+        for row in rows:
+            try:
+                self._execute(table, [row], on_conflict)
+                outcomes.append(WriteOutcome(row=row, ok=True))
+            except Exception as e:
+                outcomes.append(WriteOutcome(row=row, ok=False, error=str(e)))
+        return outcomes
+
+    @staticmethod
+    def _dedupe(rows: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        # Postgres rejects an upsert that touches the same key twice in one statement; last row wins
+        keys = [k.strip() for k in on_conflict.split(",")]
+        unique = {}
+        for row in rows:
+            unique[tuple(row.get(k) for k in keys)] = row
+        return list(unique.values())
+
+    async def write(self, table: str, rows: List[Dict[str, Any]], on_conflict: Optional[str] = None) -> List[WriteOutcome]:
+        if not rows:
+            return []
+        if on_conflict:
+            rows = self._dedupe(rows, on_conflict)
+
+        semaphore = asyncio.Semaphore(self.parallelism)
+        chunks = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+
+        async def run(chunk):
+            async with semaphore:
+                # supabase-py is synchronous; keep its round trips off the event loop
+                return await run_db(self._write_chunk, table, chunk, on_conflict)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [outcome for chunk_outcomes in results for outcome in chunk_outcomes]
+
+
+batch_writer = BatchWriter()
@@ -0,0 +1,16 @@
+import argparse
+
+from api.services.jobs import celery_app
+
+# Crawl job worker. Run from the repo root:
+#   python -m api.worker
+# or through the celery CLI:
+#   celery -A api.worker worker --pool=solo
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the crawl job worker.")
+    parser.add_argument("--loglevel", default="info")
+    args = parser.parse_args()
+
+    # One job at a time: a crawl is already concurrent inside its own event loop
+    celery_app.worker_main(["worker", "--pool=solo", "--concurrency=1", f"--loglevel={args.loglevel}"])
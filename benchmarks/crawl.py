@@ -0,0 +1,164 @@
+"""
+End-to-end crawl benchmark, fully offline.
+
+Runs CrawlerService.crawl_all against a local stand-in that replays recorded
+GitHub trending HTML, arXiv Atom and HN JSON, with an in-memory database in
+place of Supabase. Every run starts cold (no HTTP cache, HN cache or stored
+rows) and fault injection is seeded, so results are repeatable. Reports wall
+time, upstream requests, peak Python memory and rows/sec per run.
+
+    python -m benchmarks.crawl
+    python -m benchmarks.crawl --latency 0.05 --jitter 0.05 --error-rate 0.1 --repeat 5
+    python -m benchmarks.crawl --db-latency 0.02 --json results.json
+
+Exits non-zero if any source fails, so it can gate CI.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def configure_env(args, workdir: str):
+    # Must happen before anything imports api.core.config
+    os.environ.setdefault("SUPABASE_URL", "http://supabase.standin")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ["CRAWLER_HTTP_CACHE"] = "false"  # a warm validator cache would turn run 2 into 304s
+    os.environ["CRAWLER_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["CRAWLER_ARCHIVE_DIR"] = os.path.join(workdir, "archive")
+    os.environ["ARXIV_INITIAL_LOOKBACK_DAYS"] = "7"  # the recorded page spans two days
+    if not args.real_pacing:
+        # arXiv's 1 request / 3s politeness limit would dominate every run
+        os.environ["CRAWLER_HOST_RATES"] = "{}"
+
+
+def install_standins(port: int, db_latency: float):
+    """
+    Point the crawler at the stand-in server and swap Supabase for the fake, before the services import it.
+    """
+    import httpx
+    import api.core.database as database
+    from benchmarks.standin import FakeSupabase, RedirectTransport
+
+    fake = FakeSupabase(latency=db_latency)
+    database.supabase = fake
+
+    from api.core.config import settings
+    from api.services.http_client import CrawlerSession
+
+    def build_client(session):
+        limits = httpx.Limits(
+            max_connections=settings.CRAWLER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CRAWLER_MAX_KEEPALIVE,
+            keepalive_expiry=settings.CRAWLER_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(session.timeout, connect=settings.CRAWLER_CONNECT_TIMEOUT)
+        return httpx.AsyncClient(transport=RedirectTransport(port, limits=limits, retries=1), timeout=timeout)
+
+    CrawlerSession._build_client = build_client
+    return fake
+
+
+def run_once(index: int, standin, fake, workdir: str, trace_memory: bool):
+    from api.services.categories import category_registry
+    from api.services.crawl_service import CrawlerService
+
+    standin.reset()
+    fake.reset()
+    category_registry.invalidate()
+    for name in ("cache", "archive"):
+        shutil.rmtree(os.path.join(workdir, name), ignore_errors=True)
+    # Fresh crawlers, so nothing cached in memory carries over either
+    service = CrawlerService()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    summary = asyncio.run(service.crawl_all())
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    rows = fake.writes["github_projects"] + fake.writes["papers"]
+    return {
+        "run": index,
+        "wall_s": round(wall, 3),
+        "requests": sum(standin.requests.values()),
+        "injected_errors": standin.errors,
+        "bytes": standin.bytes_sent,
+        "peak_mb": round(peak / 2 ** 20, 2) if peak is not None else None,
+        "rows": rows,
+        "rows_per_sec": round(rows / wall, 1) if wall else None,
+        "sources": summary.get("sources", {}),
+    }
+
+
+def report(results):
+    print(f"\n{'run':>4}{'wall s':>9}{'requests':>10}{'errors':>8}{'KB':>9}{'peak MB':>9}{'rows':>7}{'rows/sec':>10}")
+    for r in results:
+        peak = f"{r['peak_mb']:.2f}" if r["peak_mb"] is not None else "-"
+        print(f"{r['run']:>4}{r['wall_s']:>9.3f}{r['requests']:>10}{r['injected_errors']:>8}"
+              f"{r['bytes'] / 1024:>9.0f}{peak:>9}{r['rows']:>7}{r['rows_per_sec']:>10.1f}")
+
+    if len(results) > 1:
+        median = statistics.median(r["wall_s"] for r in results)
+        rate = statistics.median(r["rows_per_sec"] for r in results)
+        # The first run also pays for starting the parse pool
+        print(f"median wall {median:.3f}s, median {rate:.1f} rows/sec")
+
+    print(f"\n{'source':<12}{'status':<10}{'rows':>6}{'requests':>10}{'retries':>9}{'p50 ms':>9}{'p95 ms':>9}{'parse ms':>10}{'write ms':>10}{'1st write ms':>14}")
+    for name, s in results[-1]["sources"].items():
+        first_write = f"{s['first_write_ms']:.1f}" if s.get("first_write_ms") is not None else "-"
+        print(f"{name:<12}{s['status']:<10}{s['rows']:>6}{s['requests']:>10}{s['retries']:>9}"
+              f"{s['latency_p50_ms'] or 0:>9.1f}{s['latency_p95_ms'] or 0:>9.1f}{s['parse_ms'] or 0:>10.1f}{s['write_ms'] or 0:>10.1f}"
+              f"{first_write:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="number of cold runs")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every upstream response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response (seeded)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of URLs answering 503 on first try")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="seconds added to every database round trip")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency jitter and fault injection")
+    parser.add_argument("--real-pacing", action="store_true", help="keep per-host rate limits (arXiv: 1 request / 3s)")
+    parser.add_argument("--no-trace-memory", action="store_true", help="skip tracemalloc, which slows the run down")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="crawl-bench-")
+    configure_env(args, workdir)
+
+    from benchmarks.standin import StandInServer
+
+    try:
+        with StandInServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed) as standin:
+            fake = install_standins(standin.port, args.db_latency)
+            results = [
+                run_once(i + 1, standin, fake, workdir, not args.no_trace_memory)
+                for i in range(args.repeat)
+            ]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "runs": results}, f, indent=2)
+
+    failed = {name for r in results for name, s in r["sources"].items() if s["status"] != "ok"}
+    if failed:
+        print(f"\nSources not ok: {', '.join(sorted(failed))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+GitHub trending parse-throughput benchmark.
+
+Runs every installed HTML parser backend over stored trending pages, checks
+that they all produce identical project dicts, and reports rows/sec.
+
+    python -m benchmarks.parse_github
+    python -m benchmarks.parse_github --pages path/to/pages --repeat 50
+"""
+import argparse
+import glob
+import os
+import time
+
+from api.services.parsers import available_parsers, parse_github_trending
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "github")
+
+
+def load_pages(directory: str):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=FIXTURES, help="directory of stored trending .html pages")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over all pages per backend")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit(f"No .html pages found in {args.pages}")
+
+    backends = available_parsers()
+    print(f"{len(pages)} page(s), {args.repeat} passes, backends: {', '.join(backends)}")
+
+    # Correctness first: every backend must agree with the html.parser fallback
+    reference = {name: parse_github_trending(html, parser="html.parser") for name, html in pages}
+    for backend in backends:
+        for name, html in pages:
+            if parse_github_trending(html, parser=backend) != reference[name]:
+                raise SystemExit(f"{backend} output differs from html.parser on {name}")
+
+    total_rows = sum(len(rows) for rows in reference.values())
+    print(f"All backends agree on {total_rows} rows per pass\n")
+
+    print(f"{'backend':<14}{'seconds':>10}{'rows/sec':>14}{'speedup':>10}")
+    baseline = None
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                parse_github_trending(html, parser=backend)
+        elapsed = time.perf_counter() - start
+        rate = total_rows * args.repeat / elapsed
+        baseline = baseline or rate
+        print(f"{backend:<14}{elapsed:>10.3f}{rate:>14,.0f}{rate / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
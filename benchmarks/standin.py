@@ -0,0 +1,357 @@
+"""
+Offline stand-ins for the crawl benchmark: a local HTTP server replaying recorded
+upstream responses, and an in-memory replacement for the Supabase client.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+EMPTY_FEED = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom"><title>ArXiv Query</title></feed>\n'
+)
+
+
+def _fraction(*parts) -> float:
+    # Deterministic value in [0, 1) for a request, so runs with the same seed inject the same faults
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+def _shift_published(xml: str, newest: datetime) -> str:
+    """
+    Move every <published>/<updated> timestamp so the newest entry was submitted at `newest`,
+    keeping their spacing. The crawler only ingests papers inside its lookback window.
+    """
+    stamps = re.findall(r"<published>([^<]+)</published>", xml)
+    latest = max(datetime.fromisoformat(s.replace("Z", "+00:00")) for s in stamps)
+    delta = newest - latest
+
+    def shift(match):
+        value = datetime.fromisoformat(match.group(2).replace("Z", "+00:00")) + delta
+        return f"<{match.group(1)}>{value.strftime('%Y-%m-%dT%H:%M:%SZ')}</{match.group(1)}>"
+
+    return re.sub(r"<(published|updated)>([^<]+Z)</\1>", shift, xml)
+
+
+class Fixtures:
+    def __init__(self, directory: str = FIXTURES):
+        with open(os.path.join(directory, "github", "trending.html"), "rb") as f:
+            self.trending = f.read()
+        with open(os.path.join(directory, "arxiv", "query.xml"), "r", encoding="utf-8") as f:
+            self.arxiv = f.read()
+        with open(os.path.join(directory, "hackernews", "topstories.json"), "rb") as f:
+            self.topstories = f.read()
+        with open(os.path.join(directory, "hackernews", "updates.json"), "rb") as f:
+            self.updates = f.read()
+        with open(os.path.join(directory, "hackernews", "items.json"), "r", encoding="utf-8") as f:
+            self.items = {key: json.dumps(item).encode() for key, item in json.load(f).items()}
+
+
+class StandInServer:
+    """
+    Serves recorded GitHub trending HTML, arXiv Atom and HN JSON on 127.0.0.1,
+    routed by the Host header the crawler sent.
+
+    Every response is delayed by `latency` plus up to `jitter` seconds. With
+    `error_rate`, that fraction of URLs answers 503 on its first request and
+    succeeds on the retry. Both are derived from `seed` and the URL, so a given
+    configuration injects exactly the same faults on every run.
+    """
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 fixtures: Optional[Fixtures] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.fixtures = fixtures or Fixtures()
+        self.requests = Counter()
+        self.errors = 0
+        self.bytes_sent = 0
+        self._attempts = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self._attempts.clear()
+            self.errors = 0
+            self.bytes_sent = 0
+
+    def route(self, host: str, target: str):
+        """
+        (status, content type, body) for one request.
+        """
+        parts = urlsplit(target)
+        if host == "github.com" and parts.path.startswith("/trending"):
+            return 200, "text/html; charset=utf-8", self.fixtures.trending
+        if host == "export.arxiv.org" and parts.path == "/api/query":
+            # One recorded page, then an empty one so paging stops
+            if int(parse_qs(parts.query).get("start", ["0"])[0]) > 0:
+                return 200, "application/atom+xml", EMPTY_FEED.encode()
+            newest = datetime.now(timezone.utc) - timedelta(minutes=5)
+            return 200, "application/atom+xml", _shift_published(self.fixtures.arxiv, newest).encode()
+        if host == "hacker-news.firebaseio.com":
+            if parts.path == "/v0/topstories.json":
+                return 200, "application/json", self.fixtures.topstories
+            if parts.path == "/v0/updates.json":
+                return 200, "application/json", self.fixtures.updates
+            match = re.fullmatch(r"/v0/item/(\d+)\.json", parts.path)
+            if match:
+                return 200, "application/json", self.fixtures.items.get(match.group(1), b"null")
+        return 404, "text/plain", b"not recorded"
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                host = (self.headers.get("Host") or "").split(":")[0]
+                key = f"{host}{self.path}"
+                with standin._lock:
+                    standin.requests[host] += 1
+                    standin._attempts[key] += 1
+                    first = standin._attempts[key] == 1
+
+                delay = standin.latency + standin.jitter * _fraction(standin.seed, "latency", key)
+                if delay:
+                    time.sleep(delay)
+
+                if first and standin.error_rate and _fraction(standin.seed, "error", key) < standin.error_rate:
+                    with standin._lock:
+                        standin.errors += 1
+                    status, content_type, body = 503, "text/plain", b"injected failure"
+                else:
+                    status, content_type, body = standin.route(host, self.path)
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 503:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+                with standin._lock:
+                    standin.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StandInServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class RedirectTransport(httpx.AsyncBaseTransport):
+    """
+    Sends every request to the stand-in server instead of its real host. The
+    Host header still names the original host, which is what the stand-in routes on.
+    """
+    def __init__(self, port: int, **transport_kwargs):
+        self.port = port
+        self.inner = httpx.AsyncHTTPTransport(**transport_kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port)
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """
+    The slice of the postgrest query builder the crawler uses, over in-memory tables.
+    """
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+        self.filters = []
+        self.ordering = None
+        self.max_rows = None
+
+    def select(self, *columns, **kwargs):
+        self.action = "select"
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: Optional[str] = None, ignore_duplicates: bool = False, **kwargs):
+        self.action, self.payload = "upsert", rows
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values, **kwargs):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: str(row.get(column)) == str(value))
+        return self
+
+    def in_(self, column, values):
+        wanted = {str(v) for v in values}
+        self.filters.append(lambda row: str(row.get(column)) in wanted)
+        return self
+
+    def like(self, column, pattern):
+        regex = re.compile("^" + ".*".join(re.escape(part) for part in pattern.split("%")) + "$")
+        self.filters.append(lambda row: row.get(column) is not None and bool(regex.match(str(row.get(column)))))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and str(row.get(column)) >= str(value))
+        return self
+
+    def order(self, column, desc: bool = False):
+        self.ordering = (column, desc)
+        return self
+
+    def limit(self, count: int):
+        self.max_rows = count
+        return self
+
+    def _matches(self, row) -> bool:
+        return all(f(row) for f in self.filters)
+
+    def execute(self) -> _Result:
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        with self.db.lock:
+            return _Result(getattr(self, f"_{self.action}")(self.db.tables[self.table]))
+
+    def _select(self, rows: List[Dict[str, Any]]):
+        found = [dict(row) for row in rows if self._matches(row)]
+        if self.ordering:
+            column, desc = self.ordering
+            found.sort(key=lambda row: str(row.get(column)), reverse=desc)
+        return found[:self.max_rows] if self.max_rows is not None else found
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        written = []
+        for row in payload:
+            row = {"id": str(uuid.uuid4()), **row}
+            rows.append(row)
+            written.append(row)
+        self.db.writes[self.table] += len(written)
+        return written
+
+    def _upsert(self, rows: List[Dict[str, Any]]):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        keys = [k.strip() for k in (self.on_conflict or "id").split(",")]
+        index = {tuple(str(row.get(k)) for k in keys): row for row in rows}
+        written = []
+        for row in payload:
+            existing = index.get(tuple(str(row.get(k)) for k in keys))
+            if existing is not None:
+                if self.ignore_duplicates:
+                    continue
+                existing.update(row)
+                written.append(existing)
+            else:
+                row = {"id": str(uuid.uuid4()), **row}
+                rows.append(row)
+                index[tuple(str(row.get(k)) for k in keys)] = row
+                written.append(row)
+        self.db.writes[self.table] += len(written)
+        return written
+
+    def _update(self, rows: List[Dict[str, Any]]):
+        updated = [row for row in rows if self._matches(row)]
+        for row in updated:
+            row.update(self.payload)
+        return updated
+
+    def _delete(self, rows: List[Dict[str, Any]]):
+        kept = [row for row in rows if not self._matches(row)]
+        removed = len(rows) - len(kept)
+        rows[:] = kept
+        return [None] * removed
+
+
+class FakeRpc:
+    def __init__(self, db: "FakeSupabase", name: str, params: Dict[str, Any]):
+        self.db, self.name, self.params = db, name, params
+
+    def execute(self) -> _Result:
+        # No other crawler shares this database: the lease is always free and stays ours
+        if self.name == "acquire_crawl_lease":
+            now = datetime.now(timezone.utc)
+            return _Result([{
+                "name": self.params["p_name"],
+                "owner": self.params["p_owner"],
+                "run_id": self.params["p_run_id"],
+                "job_id": self.params["p_job_id"],
+                "expires_at": (now + timedelta(seconds=self.params["p_ttl_seconds"])).isoformat(),
+            }])
+        if self.name == "renew_crawl_lease":
+            return _Result(True)
+        raise NotImplementedError(self.name)
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the Supabase client, counting rows written per table.
+    `latency` seconds are added to every round trip.
+    """
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.writes = Counter()
+        self.lock = threading.Lock()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> FakeRpc:
+        return FakeRpc(self, name, params)
+
+    def reset(self):
+        with self.lock:
+            self.tables.clear()
+            self.writes.clear()
@@ -22,6 +22,8 @@ export const getTrendingProjects = async (params: {
   since?: string;
   page?: number;
   limit?: number;
+  cursor?: string;
+  count?: 'exact' | 'estimated' | 'none';
 }) => {
   const response = await api.get<PaginatedResponse<GithubProject>>('/github/trending', { params });
   return response.data;
@@ -37,6 +39,8 @@ export const getLatestPapers = async (params: {
   source?: string;
   page?: number;
   limit?: number;
+  cursor?: string;
+  count?: 'exact' | 'estimated' | 'none';
 }) => {
   const response = await api.get<PaginatedResponse<Paper>>('/papers/latest', { params });
   return response.data;
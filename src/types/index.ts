@@ -9,6 +9,7 @@ export interface GithubProject {
   forks: number;
   url: string;
   trending_date: string;
+  since: 'daily' | 'weekly' | 'monthly';
 }
 
 export interface Paper {
@@ -20,6 +21,9 @@ export interface Paper {
   code_url: string | null;
   published_date: string;
   source: string;
+  external_id: string | null;
+  score: number | null;
+  comments: number | null;
   category_id: string | null;
 }
 
@@ -32,9 +36,10 @@ export interface Category {
 
 export interface PaginatedResponse<T> {
   data: T[];
-  total: number;
-  page: number;
+  total: number | null; // null with count: 'none'
+  page: number | null; // null when paging by cursor
   limit: number;
+  next_cursor: string | null; // pass as `cursor` for the next page
 }
 
 export interface User {
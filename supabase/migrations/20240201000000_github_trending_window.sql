@@ -0,0 +1,8 @@
+-- Track which trending window (daily / weekly / monthly) a GitHub row came from
+ALTER TABLE public.github_projects ADD COLUMN IF NOT EXISTS since VARCHAR(10) NOT NULL DEFAULT 'daily';
+
+-- A repo can now trend in several windows at once, so key rows on (repo_id, since)
+ALTER TABLE public.github_projects DROP CONSTRAINT IF EXISTS github_projects_repo_id_key;
+ALTER TABLE public.github_projects ADD CONSTRAINT github_projects_repo_id_since_key UNIQUE (repo_id, since);
+
+CREATE INDEX IF NOT EXISTS idx_github_since_stars ON public.github_projects(since, stars DESC);
@@ -0,0 +1,15 @@
+-- Per-source crawl progress, e.g. the newest arXiv submission seen per category.
+-- resume_* columns hold an in-flight paging position so a failed run can pick up where it stopped.
+CREATE TABLE IF NOT EXISTS public.crawl_checkpoints (
+    source VARCHAR(50) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    last_seen TIMESTAMP WITH TIME ZONE,
+    resume_start INTEGER,
+    resume_high_water TIMESTAMP WITH TIME ZONE,
+    resume_floor TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (source, key)
+);
+
+-- Only the service role (crawler) touches this table
+ALTER TABLE public.crawl_checkpoints ENABLE ROW LEVEL SECURITY;
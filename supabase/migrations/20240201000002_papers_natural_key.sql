@@ -0,0 +1,64 @@
+-- Natural key for papers: the id the source itself uses (arXiv id without version, HN item id)
+ALTER TABLE public.papers ADD COLUMN IF NOT EXISTS external_id VARCHAR(100);
+
+-- Backfill what we can derive from existing rows
+UPDATE public.papers
+SET external_id = regexp_replace(substring(pdf_url from '/pdf/(.+)$'), 'v[0-9]+$', '')
+WHERE source = 'arxiv' AND external_id IS NULL AND pdf_url LIKE '%/pdf/%';
+
+-- HN rows linking to their discussion page carry the item id in the URL
+UPDATE public.papers
+SET external_id = substring(pdf_url from 'item\?id=([0-9]+)')
+WHERE source = 'hackernews' AND external_id IS NULL AND pdf_url ~ 'news\.ycombinator\.com/item\?id=[0-9]+';
+
+-- Stories linking elsewhere never stored their id; a hash of the story URL still tells copies apart.
+-- The crawler moves these onto the item id when it sees the story again.
+UPDATE public.papers
+SET external_id = 'url:' || md5(pdf_url)
+WHERE source = 'hackernews' AND external_id IS NULL AND pdf_url IS NOT NULL;
+
+-- Collapse duplicates from the insert-every-run era, keeping the oldest row.
+-- Favorites pointing at a removed duplicate are moved to the kept row first. A user may
+-- have favorited several copies of one paper, so only one favorite per (user, kept row)
+-- survives: the one already on the kept row if any, else the oldest.
+WITH ranked AS (
+    SELECT id,
+           FIRST_VALUE(id) OVER (PARTITION BY source, external_id ORDER BY created_at, id) AS keep_id
+    FROM public.papers
+    WHERE external_id IS NOT NULL
+),
+remapped AS (
+    SELECT f.id, f.user_id, f.created_at, ranked.keep_id, ranked.id = ranked.keep_id AS on_keep
+    FROM public.favorites f
+    JOIN ranked ON f.item_type = 'paper' AND f.item_id = ranked.id::text
+)
+DELETE FROM public.favorites f
+WHERE f.id IN (SELECT id FROM remapped)
+  AND f.id NOT IN (
+      SELECT DISTINCT ON (user_id, keep_id) id
+      FROM remapped
+      ORDER BY user_id, keep_id, on_keep DESC, created_at, id
+  );
+
+WITH ranked AS (
+    SELECT id,
+           FIRST_VALUE(id) OVER (PARTITION BY source, external_id ORDER BY created_at, id) AS keep_id
+    FROM public.papers
+    WHERE external_id IS NOT NULL
+)
+UPDATE public.favorites f
+SET item_id = ranked.keep_id::text
+FROM ranked
+WHERE f.item_type = 'paper' AND f.item_id = ranked.id::text AND ranked.id <> ranked.keep_id;
+
+WITH ranked AS (
+    SELECT id,
+           ROW_NUMBER() OVER (PARTITION BY source, external_id ORDER BY created_at, id) AS rn
+    FROM public.papers
+    WHERE external_id IS NOT NULL
+)
+DELETE FROM public.papers p
+USING ranked
+WHERE p.id = ranked.id AND ranked.rn > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_papers_source_external_id ON public.papers(source, external_id);
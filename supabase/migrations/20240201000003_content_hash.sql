@@ -0,0 +1,3 @@
+-- Hash of each row's normalized crawl content; the crawler skips rewriting rows whose hash is unchanged
+ALTER TABLE public.github_projects ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE public.papers ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
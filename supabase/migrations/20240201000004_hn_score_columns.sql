@@ -0,0 +1,3 @@
+-- Live Hacker News numbers, refreshed by the crawler instead of frozen into the abstract text
+ALTER TABLE public.papers ADD COLUMN IF NOT EXISTS score INTEGER;
+ALTER TABLE public.papers ADD COLUMN IF NOT EXISTS comments INTEGER;
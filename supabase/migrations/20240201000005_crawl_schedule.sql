@@ -0,0 +1,16 @@
+-- Adaptive crawl schedule, one row per crawl source.
+-- change_rate is a moving average of how often a run found new or changed rows;
+-- the crawler derives interval_seconds from it and only runs sources whose next_run_at has passed.
+CREATE TABLE IF NOT EXISTS public.crawl_schedule (
+    source VARCHAR(50) PRIMARY KEY,
+    change_rate REAL NOT NULL DEFAULT 1,
+    interval_seconds INTEGER NOT NULL,
+    last_run_at TIMESTAMP WITH TIME ZONE,
+    last_changed_at TIMESTAMP WITH TIME ZONE,
+    last_status VARCHAR(20),
+    next_run_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the service role (crawler) touches this table
+ALTER TABLE public.crawl_schedule ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,63 @@
+-- Single-flight crawl lease: at most one crawl run holds it at a time.
+-- The holder heartbeats to push expires_at forward; a crashed holder's lease simply expires.
+CREATE TABLE IF NOT EXISTS public.crawl_leases (
+    name VARCHAR(50) PRIMARY KEY,
+    owner TEXT NOT NULL,
+    run_id UUID NOT NULL,
+    job_id TEXT,
+    acquired_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    heartbeat_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+ALTER TABLE public.crawl_leases ENABLE ROW LEVEL SECURITY;
+
+-- Take the lease if it is free or expired. Returns the lease row, or nothing if someone else holds it.
+CREATE OR REPLACE FUNCTION public.acquire_crawl_lease(
+    p_name TEXT, p_owner TEXT, p_run_id UUID, p_job_id TEXT, p_ttl_seconds INTEGER
+)
+RETURNS SETOF public.crawl_leases
+LANGUAGE sql
+AS $$
+    INSERT INTO public.crawl_leases AS l (name, owner, run_id, job_id, acquired_at, heartbeat_at, expires_at)
+    VALUES (p_name, p_owner, p_run_id, p_job_id, NOW(), NOW(), NOW() + make_interval(secs => p_ttl_seconds))
+    ON CONFLICT (name) DO UPDATE
+        SET owner = EXCLUDED.owner,
+            run_id = EXCLUDED.run_id,
+            job_id = EXCLUDED.job_id,
+            acquired_at = EXCLUDED.acquired_at,
+            heartbeat_at = EXCLUDED.heartbeat_at,
+            expires_at = EXCLUDED.expires_at
+        WHERE l.expires_at < NOW()
+    RETURNING *;
+$$;
+
+-- Extend a lease we still own. Returns false if it expired and was taken over.
+CREATE OR REPLACE FUNCTION public.renew_crawl_lease(p_name TEXT, p_owner TEXT, p_ttl_seconds INTEGER)
+RETURNS BOOLEAN
+LANGUAGE sql
+AS $$
+    WITH renewed AS (
+        UPDATE public.crawl_leases
+           SET heartbeat_at = NOW(), expires_at = NOW() + make_interval(secs => p_ttl_seconds)
+         WHERE name = p_name AND owner = p_owner
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM renewed);
+$$;
+
+-- One row per crawl run, whoever triggered it
+CREATE TABLE IF NOT EXISTS public.crawl_runs (
+    id UUID PRIMARY KEY,
+    job_id TEXT,
+    owner TEXT,
+    sources TEXT[],
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE,
+    summary JSONB
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_runs_started_at ON public.crawl_runs (started_at DESC);
+
+ALTER TABLE public.crawl_runs ENABLE ROW LEVEL SECURITY;
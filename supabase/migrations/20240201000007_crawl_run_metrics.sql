@@ -0,0 +1,7 @@
+-- Run-wide crawl telemetry. Per-source detail (latency percentiles, parse/write time,
+-- rows/sec) is kept in summary->'sources'.
+ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS duration_ms INTEGER;
+ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS rows INTEGER;
+ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS requests INTEGER;
+ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS bytes_downloaded BIGINT;
+ALTER TABLE public.crawl_runs ADD COLUMN IF NOT EXISTS retries INTEGER;
@@ -0,0 +1,12 @@
+-- Keyset (cursor) pagination: list endpoints order by (stars, id) / (published_date, id),
+-- so each filter combination gets an index in exactly that order and any page is one index range scan.
+UPDATE public.github_projects SET stars = 0 WHERE stars IS NULL;
+ALTER TABLE public.github_projects ALTER COLUMN stars SET NOT NULL;
+
+DROP INDEX IF EXISTS public.idx_github_since_stars;
+CREATE INDEX IF NOT EXISTS idx_github_since_stars_id ON public.github_projects (since, stars DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_github_since_language_stars_id ON public.github_projects (since, language, stars DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_papers_date_id ON public.papers (published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_papers_category_date_id ON public.papers (category_id, published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_papers_source_date_id ON public.papers (source, published_date DESC, id DESC);
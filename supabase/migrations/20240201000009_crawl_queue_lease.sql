@@ -0,0 +1,3 @@
+-- The crawl-queue lease marks a crawl job that is queued but not yet picked up by a worker.
+-- It has no run yet, so run_id may be empty.
+ALTER TABLE public.crawl_leases ALTER COLUMN run_id DROP NOT NULL;
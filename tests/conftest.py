@@ -0,0 +1,14 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the environment has to be in place before any api module loads.
+# No test talks to Supabase, Redis or upstream sites.
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_KEY", "test")
+os.environ["VERCEL"] = "1"  # skips database.py's local proxy fix
+os.environ["CRAWLER_HTTP_CACHE"] = "false"
+os.environ["CRAWLER_ARCHIVE"] = "false"
+os.environ["CRAWLER_CACHE_DIR"] = tempfile.mkdtemp(prefix="techvision-tests-")
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+os.environ["CELERY_TASK_ALWAYS_EAGER"] = "true"  # jobs run in-process; results stay in memory
+os.environ["CELERY_BROKER_URL"] = "memory://"
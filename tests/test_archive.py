@@ -0,0 +1,45 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from api.services.archive import ResponseArchive
+
+
+def days_ago(days):
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def test_streamed_bodies_read_back_whole(tmp_path):
+    archive = ResponseArchive(str(tmp_path), max_bytes=0, max_age_days=0)
+    writer = archive.writer("arxiv", "http://export.arxiv.org/api/query", "application/atom+xml")
+    for chunk in (b"<feed>", b"<entry/>" * 1000, b"</feed>"):
+        writer.write(chunk)
+    digest = writer.close()
+
+    assert archive.read(digest) == b"<feed>" + b"<entry/>" * 1000 + b"</feed>"
+    # The same content again is indexed twice but stored once
+    assert archive.put("arxiv", "http://export.arxiv.org/api/query", archive.read(digest)) == digest
+    assert [e["sha256"] for e in archive.entries()] == [digest, digest]
+    assert not [name for _, _, names in os.walk(tmp_path / "objects") for name in names if name.endswith(".tmp")]
+
+
+def test_prune_drops_days_past_the_age_limit(tmp_path):
+    archive = ResponseArchive(str(tmp_path), max_bytes=0, max_age_days=0)
+    old = archive.put("github", "https://github.com/trending", b"old page", fetched_at=days_ago(40))
+    both = archive.put("github", "https://github.com/trending", b"same page", fetched_at=days_ago(40))
+    archive.put("github", "https://github.com/trending", b"same page", fetched_at=days_ago(1))
+
+    archive.max_age_days = 30
+    assert archive.prune() == {"days": 1, "objects": 1}
+    assert [e["sha256"] for e in archive.entries()] == [both]
+    assert not os.path.exists(archive._object_path(old))
+    assert archive.read(both) == b"same page"
+
+
+def test_prune_drops_oldest_days_until_under_the_size_limit(tmp_path):
+    archive = ResponseArchive(str(tmp_path), max_bytes=0, max_age_days=0)
+    digests = [archive.put("hackernews", f"https://hn/{day}", os.urandom(2000), fetched_at=days_ago(day)) for day in (3, 2, 1)]
+    size = os.path.getsize(archive._object_path(digests[0]))
+
+    archive.max_bytes = 2 * size + size // 2
+    assert archive.prune() == {"days": 1, "objects": 1}
+    assert [e["sha256"] for e in archive.entries()] == digests[1:]
@@ -0,0 +1,39 @@
+import asyncio
+import re
+from datetime import datetime, timezone
+
+from api.services import crawlers
+from api.services.crawlers import ArxivCrawler
+
+
+def test_an_empty_page_partway_through_resumes_next_run(monkeypatch):
+    checkpoints = {}
+    monkeypatch.setattr(crawlers, "load_checkpoint", lambda source, key: dict(checkpoints))
+    monkeypatch.setattr(crawlers, "save_checkpoint", lambda source, key, **fields: checkpoints.update(fields))
+    crawler = ArxivCrawler()
+    monkeypatch.setattr(crawler, "_category_id", lambda category: "cat")
+
+    newest = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    # Page 2 of the first run comes back empty; the second run gets results again
+    pages = iter([3, 0, 3, 0])
+    starts = []
+
+    async def ingest_page(url, floor, high_water, category_id, sink, conditional=False):
+        starts.append(int(re.search(r"start=(\d+)", url).group(1)))
+        seen = next(pages)
+        return seen, seen, newest if seen else high_water
+
+    monkeypatch.setattr(crawler, "_ingest_page", ingest_page)
+
+    async def sink(papers):
+        pass
+
+    asyncio.run(crawler.ingest_category("cs.CV", sink))
+    assert starts == [0, 3]
+    # Not caught up: the paging position is kept and nothing is marked as seen yet
+    assert checkpoints["resume_start"] == 3
+    assert checkpoints.get("last_seen") is None
+
+    asyncio.run(crawler.ingest_category("cs.CV", sink))
+    assert starts == [0, 3, 3, 6]
+    assert checkpoints["resume_start"] == 6
@@ -0,0 +1,164 @@
+import asyncio
+import socket
+import threading
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from api.core.config import settings
+from api.services import crawlers
+from api.services.crawlers import BaseCrawler
+from api.services.http_cache import HttpValidatorCache, NotModified
+from api.services.http_client import CrawlerSession, DNSCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = f"hello {self.headers.get('Host')}".encode()
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class CountingDNSCache(DNSCache):
+    def __init__(self):
+        super().__init__(ttl=60)
+        self.lookups = 0
+
+    async def resolve(self, host, port):
+        if (host, port) not in self._entries:
+            self.lookups += 1
+        return await super().resolve(host, port)
+
+
+def test_requests_connect_through_the_dns_cache(server):
+    async def run():
+        session = CrawlerSession(proxy=None)
+        session.dns_cache = CountingDNSCache()
+        async with session:
+            first = await session.get(f"http://localhost:{server}/a")
+            second = await session.get(f"http://localhost:{server}/b")
+        return session.dns_cache.lookups, first, second
+
+    lookups, first, second = asyncio.run(run())
+    assert first.status_code == second.status_code == 200
+    # Host header keeps the name; only the connection used the cached address
+    assert first.text == f"hello localhost:{server}"
+    assert first.num_bytes_downloaded == len(first.content)
+    assert lookups == 1
+
+
+def test_connect_errors_surface_as_httpx_errors():
+    # A port nothing listens on
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    async def run():
+        async with CrawlerSession(proxy=None) as session:
+            await session.get(f"http://127.0.0.1:{port}/")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
+
+
+def test_streaming_reads_the_body_in_chunks(server):
+    async def run():
+        async with CrawlerSession(proxy=None) as session:
+            async with session.stream(f"http://127.0.0.1:{server}/") as response:
+                return b"".join([chunk async for chunk in response.aiter_bytes()])
+
+    assert asyncio.run(run()) == f"hello 127.0.0.1:{server}".encode()
+
+
+def test_validators_are_stored_only_once_committed(server, tmp_path):
+    cache = HttpValidatorCache(directory=str(tmp_path))
+    url = f"http://127.0.0.1:{server}/page"
+
+    async def run():
+        async with CrawlerSession(proxy=None, validator_cache=cache) as session:
+            # Nothing committed (say the write failed): the next run fetches the page again
+            assert (await session.get(url, conditional=True)).status_code == 200
+            assert cache.get(url) is None
+            assert (await session.get(url, conditional=True)).status_code == 200
+            await session.commit_validators(url)
+            with pytest.raises(NotModified):
+                await session.get(url, conditional=True)
+
+    asyncio.run(run())
+    assert cache.get(url)["etag"] == '"v1"'
+
+
+def test_streams_revalidate_like_gets(server, tmp_path):
+    cache = HttpValidatorCache(directory=str(tmp_path))
+    url = f"http://127.0.0.1:{server}/feed"
+
+    async def run():
+        async with CrawlerSession(proxy=None, validator_cache=cache) as session:
+            async with session.stream(url, conditional=True) as response:
+                assert await response.aread()
+            await session.commit_validators(url)
+            with pytest.raises(NotModified):
+                async with session.stream(url, conditional=True):
+                    pass
+
+    asyncio.run(run())
+
+
+class FlakySession:
+    """
+    Stands in for CrawlerSession.stream: the first `failures` opens fail before any response arrives.
+    """
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.opened = 0
+
+    @asynccontextmanager
+    async def stream(self, url, conditional=False):
+        self.opened += 1
+        if self.opened <= self.failures:
+            raise self.error
+        yield httpx.Response(200, content=b"body", request=httpx.Request("GET", url))
+
+
+@pytest.mark.parametrize("error", [httpx.ConnectTimeout("slow"), httpx.ConnectError("refused"), httpx.RemoteProtocolError("dropped")])
+def test_streams_retry_transport_errors_before_the_body(monkeypatch, error):
+    monkeypatch.setattr(crawlers, "backoff_delay", lambda attempt, response=None: 0)
+    crawler = BaseCrawler()
+    crawler.session = FlakySession(failures=2, error=error)
+
+    async def run():
+        async with crawler.stream("http://example.test/feed") as response:
+            return await response.aread()
+
+    assert asyncio.run(run()) == b"body"
+    assert crawler.session.opened == 3
+
+    crawler.session = FlakySession(failures=100, error=error)
+    with pytest.raises(type(error)):
+        asyncio.run(run())
+    assert crawler.session.opened == settings.CRAWLER_MAX_RETRIES + 1
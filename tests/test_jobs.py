@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.routers import admin
+from api.services import jobs
+from api.services.crawl_service import crawler_service
+
+
+class FakeLease:
+    """
+    In-memory crawl_leases row for one lease name.
+    """
+    def __init__(self):
+        self.row = None
+
+    def acquire(self, owner, run_id, job_id=None):
+        if self.row is not None:
+            return None
+        self.row = {"owner": owner, "run_id": run_id, "job_id": job_id}
+        return self.row
+
+    def current(self):
+        return self.row
+
+    def release(self, owner):
+        if self.row is not None and self.row["owner"] == owner:
+            self.row = None
+
+
+@pytest.fixture(autouse=True)
+def leases(monkeypatch):
+    running, queued = FakeLease(), FakeLease()
+    for method in ("acquire", "current", "release"):
+        monkeypatch.setattr(admin.crawl_lease, method, getattr(running, method))
+        monkeypatch.setattr(jobs.crawl_queue, method, getattr(queued, method))
+    return running, queued
+
+
+@pytest.fixture
+def crawl(monkeypatch):
+    calls = []
+
+    async def crawl_all(names=None, job_id=None):
+        calls.append((names, job_id))
+        return {"status": "success", "sources": names}
+
+    monkeypatch.setattr(crawler_service, "crawl_all", crawl_all)
+    return calls
+
+
+def test_eager_jobs_keep_their_result_without_redis(crawl):
+    assert jobs.celery_app.conf.result_backend == "cache+memory://"
+    job_id = jobs.enqueue_crawl(["github"])
+    assert crawl == [(["github"], job_id)]
+    status = jobs.job_status(job_id)
+    assert status["status"] == "SUCCESS"
+    assert status["result"] == {"status": "success", "sources": ["github"]}
+
+
+def test_jobs_past_the_time_limit_are_cancelled(monkeypatch):
+    cancelled = []
+
+    async def crawl_all(names=None, job_id=None):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(job_id)
+            raise
+
+    monkeypatch.setattr(crawler_service, "crawl_all", crawl_all)
+    monkeypatch.setattr(jobs, "JOB_TIME_LIMIT", 0.05)
+    job_id = jobs.enqueue_crawl()
+    status = jobs.job_status(job_id)
+    assert status["status"] == "FAILURE"
+    assert "exceeded" in status["error"]
+    assert cancelled == [job_id]
+
+
+def test_worker_runs_jobs_from_the_memory_broker(crawl, monkeypatch):
+    monkeypatch.setattr(jobs.celery_app.conf, "task_always_eager", False)
+    with start_worker(jobs.celery_app, pool="solo", perform_ping_check=False, shutdown_timeout=10):
+        job_id = jobs.enqueue_crawl(["arxiv"])
+        result = jobs.celery_app.AsyncResult(job_id).get(timeout=10)
+    assert result == {"status": "success", "sources": ["arxiv"]}
+    assert crawl == [(["arxiv"], job_id)]
+
+
+def test_triggers_return_the_queued_job_instead_of_queueing_another(leases, monkeypatch):
+    running, queued = leases
+    enqueued = []
+    # No worker picks the job up, so it stays queued
+    monkeypatch.setattr(admin, "enqueue_crawl", lambda sources, due_only, job_id: enqueued.append(job_id) or job_id)
+
+    first = asyncio.run(admin._queue_crawl(None, True))
+    second = asyncio.run(admin._queue_crawl(None, True))
+    assert enqueued == [first["job_id"]]
+    assert second == {"message": "Crawl job already queued", "job_id": first["job_id"], "attached": True}
+
+    # Once the worker has it, the next trigger attaches to the run instead
+    queued.release(jobs.queue_owner(first["job_id"]))
+    running.acquire("worker", "run-1", first["job_id"])
+    third = asyncio.run(admin._queue_crawl(None, True))
+    assert third["run_id"] == "run-1" and enqueued == [first["job_id"]]
+
+
+def test_picked_up_jobs_free_the_queue(leases, crawl):
+    _, queued = leases
+    first = asyncio.run(admin._queue_crawl(["github"], False))
+    # Eager: the job already ran inside the trigger
+    assert queued.row is None
+    second = asyncio.run(admin._queue_crawl(["github"], False))
+    assert second["job_id"] != first["job_id"]
+    assert [job_id for _, job_id in crawl] == [first["job_id"], second["job_id"]]
+
+
+def test_run_ids_that_are_not_uuids_are_rejected(monkeypatch):
+    looked_up = []
+    monkeypatch.setattr(admin, "get_run", lambda run_id: looked_up.append(run_id))
+    client = TestClient(app)
+    assert client.get("/api/admin/crawl/runs/not-a-uuid").status_code == 422
+    run_id = "6f1c2b3a-0000-4000-8000-000000000001"
+    assert client.get(f"/api/admin/crawl/runs/{run_id}").status_code == 404
+    assert looked_up == [run_id]
@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api.services.crawl_executor import CrawlExecutor
+from api.services.lease import CrawlLease, LeaseLost
+
+
+class StuckSource:
+    """
+    A source that never finishes on its own.
+    """
+    name = "stuck"
+    timeout = 60
+    concurrency = 1
+
+    def __init__(self):
+        self.crawler = SimpleNamespace(session=None, slots=None)
+        self.cancelled = False
+
+    async def run(self, stats):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def test_losing_the_lease_stops_the_run(monkeypatch):
+    lease = CrawlLease("test", ttl=0.03)
+    monkeypatch.setattr(lease, "acquire", lambda owner, run_id, job_id=None: {"owner": owner, "run_id": run_id})
+    # Another run took the lease over: the first renewal fails
+    monkeypatch.setattr(lease, "renew", lambda owner: False)
+    monkeypatch.setattr(lease, "release", lambda owner: None)
+    source = StuckSource()
+
+    async def run():
+        async with lease.hold("run-1"):
+            await CrawlExecutor(time_limit=60).run([source])
+
+    with pytest.raises(LeaseLost):
+        asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert source.cancelled
+    assert source.crawler.session is None
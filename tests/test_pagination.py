@@ -0,0 +1,44 @@
+import base64
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursors_round_trip():
+    paper_id = str(uuid.uuid4())
+    assert decode_cursor(encode_cursor("stars", {"stars": 1200, "id": 7}), "github_projects", "stars") == (1200, 7)
+    cursor = encode_cursor("published_date", {"published_date": "2024-02-01", "id": paper_id})
+    assert decode_cursor(cursor, "papers", "published_date") == ("2024-02-01", paper_id)
+
+
+@pytest.mark.parametrize("table, cursor", [
+    ("github_projects", "not a cursor"),
+    ("github_projects", raw_cursor("published_date", "2024-02-01", 7)),
+    ("github_projects", raw_cursor("stars", "1200", 7)),
+    ("github_projects", raw_cursor("stars", True, 7)),
+    ("github_projects", raw_cursor("stars", 1200, '7),id.gt.(0')),
+    ("papers", raw_cursor("published_date", "yesterday", str(uuid.uuid4()))),
+    ("papers", raw_cursor("published_date", 20240201, str(uuid.uuid4()))),
+    ("papers", raw_cursor("published_date", "2024-02-01", 7)),
+    ("papers", raw_cursor("published_date", "2024-02-01", '"),id.gt.(')),
+])
+def test_cursors_with_the_wrong_types_are_rejected(table, cursor):
+    sort = "stars" if table == "github_projects" else "published_date"
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, table, sort)
+
+
+def test_bad_cursors_are_a_400():
+    client = TestClient(app)
+    bad = raw_cursor("stars", {"sql": 1}, 7)
+    assert client.get("/api/github/trending", params={"cursor": bad}).status_code == 400
+    assert client.get("/api/papers/latest", params={"cursor": raw_cursor("published_date", "2024-02-01", 7)}).status_code == 400
@@ -0,0 +1,115 @@
+import asyncio
+import socket
+import threading
+
+import fakeredis
+import pytest
+
+from api.core.config import settings
+from api.services.response_cache import RedisTier, ResponseCache
+
+
+@pytest.fixture
+def tier():
+    return RedisTier(client=fakeredis.FakeRedis(), ttl=60)
+
+
+def cache_with(tier):
+    return ResponseCache(ttl=60, generation_poll=0, shared=tier)
+
+
+def loader(value, calls):
+    async def load():
+        calls.append(value)
+        return value
+    return load
+
+
+def test_instances_share_responses_through_redis(tier):
+    calls = []
+
+    async def run():
+        first, second = cache_with(tier), cache_with(tier)
+        # Miss everywhere: loaded from the database and stored in Redis
+        a = await first.get_or_load("trending", {"page": 1}, loader({"data": [1]}, calls))
+        # A cold instance finds it in Redis
+        b = await second.get_or_load("trending", {"page": 1}, loader({"data": [2]}, calls))
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert a == b == {"data": [1]}
+    assert calls == [{"data": [1]}]
+    assert tier.stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_large_payloads_round_trip_compressed(tier):
+    value = {"data": [{"title": "x" * 50}] * 100}
+    assert RedisTier.encode(value)[:1] == b"z"
+    asyncio.run(tier.put(0, ("latest",), value))
+    assert asyncio.run(tier.get(0, ("latest",))) == value
+
+
+def test_invalidation_moves_every_instance_to_a_new_namespace(tier):
+    calls = []
+
+    async def run():
+        first, second = cache_with(tier), cache_with(tier)
+        await first.get_or_load("latest", {}, loader("old", calls))
+        await second.get_or_load("latest", {}, loader("old?", calls))
+        # A crawl finished on the first instance
+        await first.invalidate()
+        return (
+            await first.get_or_load("latest", {}, loader("new", calls)),
+            await second.get_or_load("latest", {}, loader("new?", calls)),
+        )
+
+    assert asyncio.run(run()) == ("new", "new")
+    # The second instance dropped its local copy and found the reload in Redis
+    assert calls == ["old", "new"]
+
+
+def test_redis_down_fails_open_to_the_database(monkeypatch):
+    # A port nothing listens on
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_REDIS_RETRY", 60)
+    tier = RedisTier(url=f"redis://127.0.0.1:{port}/0", ttl=60)
+    cache = cache_with(tier)
+    calls = []
+
+    async def run():
+        return [await cache.get_or_load("trending", {"page": page}, loader(page, calls)) for page in (1, 2)]
+
+    assert asyncio.run(run()) == [1, 2]
+    assert calls == [1, 2]
+    # One failed call, then the tier is skipped until the retry delay is up
+    assert tier.errors == 1
+
+
+def test_bumps_from_another_thread_keep_the_entries_consistent():
+    cache = ResponseCache(ttl=60, max_entries=50, max_bytes=2000, generation_source=None)
+    done = threading.Event()
+
+    def invalidate():
+        # As an eager crawl job does from its own thread and event loop
+        while not done.is_set():
+            asyncio.run(cache.invalidate())
+
+    bumper = threading.Thread(target=invalidate)
+    bumper.start()
+    try:
+        for i in range(20000):
+            cache.put(("k", i % 80), "x" * (i % 40))
+            cache.get(("k", (i * 7) % 80))
+    finally:
+        done.set()
+        bumper.join()
+    assert cache.generation > 0
+    assert cache._bytes == sum(size for _, size, _ in cache._entries.values())
+
+    # A load that started before a bump isn't kept
+    generation = cache.generation
+    cache.bump()
+    cache.put(("late",), "old", generation)
+    assert cache.get(("late",)) is None
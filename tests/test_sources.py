@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+from api.core.config import settings
+from api.services.crawlers import FetchFailed
+from api.services.sources import CrawlSource, GithubSource, HackerNewsSource
+from api.services.writer import WriteOutcome
+
+
+class FakeSource(CrawlSource):
+    """
+    Units are page numbers; each page parses to two rows. Rows named in `fail` don't get written.
+    """
+    name = "fake"
+
+    def __init__(self, pages, fail=(), broken=()):
+        super().__init__()
+        self.pages = pages
+        self.fail = set(fail)
+        self.broken = set(broken)
+        self.committed = []
+
+    async def requests(self):
+        for page in range(self.pages):
+            yield page
+
+    async def fetch(self, page):
+        return page
+
+    async def parse(self, page):
+        if page in self.broken:
+            raise ValueError(f"page {page} does not parse")
+        return [{"name": f"{page}-a"}, {"name": f"{page}-b"}]
+
+    async def normalize(self, row):
+        # Every page's second row duplicates something already seen
+        return None if row["name"].endswith("-b") else row
+
+    async def write(self, rows, stats):
+        return [WriteOutcome(row, row["name"] not in self.fail, "boom") for row in rows]
+
+    async def commit(self, page):
+        self.committed.append(page)
+
+
+def test_units_are_committed_once_all_their_rows_are_written():
+    source = FakeSource(pages=3)
+    assert asyncio.run(source.run({})) == 3
+    assert sorted(source.committed) == [0, 1, 2]
+
+
+def test_failed_rows_and_parse_errors_hold_back_their_unit():
+    source = FakeSource(pages=4, fail={"1-a"}, broken={3})
+    asyncio.run(source.run({}))
+    assert sorted(source.committed) == [0, 2]
+
+
+def test_github_pages_past_the_deadline_are_dropped(monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_CRAWL_TIME_LIMIT", 0.2)
+    source = GithubSource()
+    monkeypatch.setattr(source.crawler, "trending_cells", lambda: [("", "daily"), ("rust", "daily")])
+
+    async def fetch_with_retry(url, conditional=False):
+        await asyncio.sleep(5 if "rust" in url else 0)
+        return SimpleNamespace(text="<html/>"), 0
+
+    monkeypatch.setattr(source.crawler, "fetch_with_retry", fetch_with_retry)
+
+    async def run():
+        cells = [cell async for cell in source.requests()]
+        return await asyncio.gather(*(source.fetch(cell) for cell in cells))
+
+    fast, slow = asyncio.run(run())
+    assert fast == ("https://github.com/trending", "<html/>", "daily")
+    assert slow is None
+    assert source._late == 1
+
+
+def test_hn_items_report_their_retries(monkeypatch, capsys):
+    source = HackerNewsSource()
+    crawler = source.crawler
+
+    async def fetch_with_retry(url, conditional=False):
+        if url.endswith("/2.json"):
+            raise FetchFailed(url, 3, TimeoutError("slow"))
+        return SimpleNamespace(json=lambda: {"id": 1, "type": "story"}), 1
+
+    monkeypatch.setattr(crawler, "fetch_with_retry", fetch_with_retry)
+    monkeypatch.setattr(crawler.cache, "is_fresh", lambda sid: False)
+
+    async def run():
+        return [await crawler.get_item(sid, set()) for sid in (1, 2)]
+
+    fetched, failed = asyncio.run(run())
+    assert fetched == {"id": 1, "type": "story"} and failed is None
+    crawler.report(2)
+    out = capsys.readouterr().out
+    assert "Error fetching HN item 2 after 3 retries" in out
+    assert "HN items needing retries: 1x1, 2x3" in out
+    assert crawler.retried == {}
+
+
+def test_hn_keeps_the_previous_top_stories_on_a_bad_response(monkeypatch):
+    crawler = HackerNewsSource().crawler
+    bodies = iter([[3, 2, 1], {"error": "rate limited"}, [4, "5", True]])
+    seen = []
+
+    async def fetch_with_retry(url, conditional=False):
+        seen.append(conditional)
+        body = next(bodies, None)
+        if body is None:
+            raise FetchFailed(url, 3, TimeoutError("slow"))
+        return SimpleNamespace(json=lambda: body), 0
+
+    monkeypatch.setattr(crawler, "fetch_with_retry", fetch_with_retry)
+    monkeypatch.setattr(crawler.cache, "top_ids", [])
+
+    async def run():
+        return [await crawler.top_story_ids(limit=10) for _ in range(4)]
+
+    assert asyncio.run(run()) == [[3, 2, 1]] * 4
+    # No previous list to fall back on: the first fetch isn't conditional
+    assert seen == [False, True, True, True]